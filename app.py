@@ -8,16 +8,43 @@ A web interface for analyzing cryptocurrency and Dubai real estate valuations.
 import streamlit as st
 import sys
 import os
+import hashlib
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
-from crypto_module.undervalued_test import run_undervalued_test
-from crypto_module.data_fetcher import CryptoDataFetcher
-from dubai_property_module.property_analyzer import analyze_dubai_property
 from shared_utils.secrets_manager import load_secrets, get_secret
 
+# Analysis modules (and their pandas/numpy imports) are loaded lazily
+# inside the pages that use them to keep cold start fast
+if TYPE_CHECKING:
+    from crypto_module.data_fetcher import CryptoDataFetcher
+
+
+# Supported cryptocurrencies (display names)
+SUPPORTED_CRYPTOS = (
+    "Bitcoin", "Ethereum", "Zcash", "Monero", "Cardano", "Solana",
+    "Polkadot", "Chainlink", "Avalanche", "Polygon", "Algorand",
+    "Cosmos", "Tezos", "VeChain", "Hedera", "NEAR Protocol",
+    "Fantom", "Harmony", "Elrond", "Zilliqa", "Theta"
+)
+
+# Dubai areas and property types offered on the property page
+DUBAI_AREAS = (
+    "Dubai Marina", "Downtown Dubai", "JBR", "Palm Jumeirah",
+    "Business Bay", "DIFC", "JVC", "Sports City", "Discovery Gardens"
+)
+
+PROPERTY_TYPES = ("Apartment", "Villa", "Townhouse", "Penthouse", "Studio")
+
+# Maximum number of options rendered in the coin selectbox
+MAX_COIN_OPTIONS = 50
+
+# Show full tracebacks in the UI only when OUVC_DEBUG=1
+DEBUG = os.getenv("OUVC_DEBUG") == "1"
+
 
 # Page configuration
 st.set_page_config(
@@ -28,12 +55,103 @@ st.set_page_config(
 )
 
 
+def _api_key_digest(api_key: Optional[str]) -> Optional[str]:
+    """Hash an API key so it can take part in a cache key without being stored"""
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@st.cache_resource
+def get_fetcher() -> "CryptoDataFetcher":
+    """Shared CryptoDataFetcher instance, created once per process"""
+    from crypto_module.data_fetcher import CryptoDataFetcher
+    return CryptoDataFetcher()
+
+
+@st.cache_resource
+def _display_to_id() -> Dict[str, str]:
+    """Map each selectbox display name to its CoinGecko id, built once"""
+    from crypto_module.data_fetcher import get_coin_id
+    return {name: get_coin_id(name) for name in SUPPORTED_CRYPTOS}
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_coin_data(coin_id: str, api_key_digest: Optional[str]) -> Dict:
+    """
+    Fetch coin data (CoinGecko + DeFiLlama TVL), cached for 5 minutes
+
+    The API key digest is only part of the cache key, so results fetched
+    with one key are not served after the key changes.
+    """
+    fetcher = get_fetcher()
+    return fetcher.get_coin_data(coin_id)
+
+
+@st.cache_resource
+def _load_secrets_once() -> bool:
+    """Load API keys into the environment once per process"""
+    load_secrets()
+    return True
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _run_crypto_analysis(crypto_name: str,
+                         use_api: bool,
+                         new_coins_per_year: float,
+                         value_locked: float,
+                         api_key_digest: Optional[str]) -> Optional[Dict]:
+    """
+    Run the crypto analysis pipeline, cached for 5 minutes per set of inputs
+
+    Returns None when live data could not be fetched.
+    """
+    from crypto_module.undervalued_test import run_undervalued_test
+
+    if use_api:
+        coin_data = _cached_coin_data(_display_to_id()[crypto_name], api_key_digest)
+        if not coin_data:
+            return None
+        return run_undervalued_test(
+            crypto_name=crypto_name,
+            new_coins_per_year=coin_data.get('new_coins_per_year', 0),
+            value_locked=coin_data.get('value_locked', 0),
+            coin_data=coin_data
+        )
+
+    return run_undervalued_test(
+        crypto_name=crypto_name,
+        new_coins_per_year=new_coins_per_year,
+        value_locked=value_locked
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _run_property_analysis(area: str,
+                           property_type: str,
+                           bedrooms: int,
+                           size_sqft: float,
+                           asking_price: float,
+                           use_api: bool) -> Dict:
+    """Run the property analysis pipeline, cached for 5 minutes per set of inputs"""
+    from dubai_property_module.property_analyzer import analyze_dubai_property
+
+    return analyze_dubai_property(
+        area=area,
+        property_type=property_type,
+        bedrooms=bedrooms,
+        size_sqft=size_sqft,
+        asking_price_aed=asking_price,
+        use_api=use_api
+    )
+
+
 def init_session_state():
     """Initialize session state variables"""
     if 'api_keys_loaded' not in st.session_state:
         st.session_state.api_keys_loaded = False
         try:
-            load_secrets()
+            _load_secrets_once()
             st.session_state.api_keys_loaded = True
         except Exception:
             st.session_state.api_keys_loaded = False
@@ -48,6 +166,7 @@ def display_header():
     st.divider()
 
 
+@st.fragment
 def crypto_analysis_page():
     """Cryptocurrency analysis interface"""
     st.header("🪙 Cryptocurrency Valuation Analysis")
@@ -63,19 +182,26 @@ def crypto_analysis_page():
     with col1:
         st.subheader("Crypto Selection")
 
-        # Supported cryptocurrencies
-        supported_cryptos = [
-            "Bitcoin", "Ethereum", "Zcash", "Monero", "Cardano", "Solana",
-            "Polkadot", "Chainlink", "Avalanche", "Polygon", "Algorand",
-            "Cosmos", "Tezos", "VeChain", "Hedera", "NEAR Protocol",
-            "Fantom", "Harmony", "Elrond", "Zilliqa", "Theta"
-        ]
-
+        # Filter the coin list so the selectbox only renders a capped subset
+        coin_filter = st.text_input(
+            "Filter coins",
+            "",
+            help="Type part of a coin name to narrow the list"
+        ).lower().strip()
+        filtered = [c for c in SUPPORTED_CRYPTOS if coin_filter in c.lower()][:MAX_COIN_OPTIONS]
+        if not filtered:
+            st.caption("No coins match the filter, showing all coins")
+            filtered = list(SUPPORTED_CRYPTOS[:MAX_COIN_OPTIONS])
+
+        # Keep the previous selection when refining the filter
+        last_crypto = st.session_state.get('last_crypto')
         crypto_name = st.selectbox(
             "Select Cryptocurrency",
-            options=supported_cryptos,
+            options=filtered,
+            index=filtered.index(last_crypto) if last_crypto in filtered else 0,
             help="Choose a cryptocurrency to analyze"
         )
+        st.session_state.last_crypto = crypto_name
 
         use_api = st.checkbox(
             "Fetch live data from CoinGecko API",
@@ -111,32 +237,21 @@ def crypto_analysis_page():
     if st.button("🔍 Analyze Cryptocurrency", type="primary", use_container_width=True):
         with st.spinner(f"Analyzing {crypto_name}..."):
             try:
-                if use_api:
-                    # Fetch data from API
-                    fetcher = CryptoDataFetcher()
-                    coin_data = fetcher.get_coin_data(crypto_name)
-
-                    if coin_data:
-                        result = run_undervalued_test(
-                            crypto_name=crypto_name,
-                            new_coins_per_year=coin_data.get('new_coins_per_year', 0),
-                            value_locked=coin_data.get('value_locked', 0),
-                            coin_data=coin_data
-                        )
-                    else:
-                        st.error(f"Could not fetch data for {crypto_name}. Please try manual entry.")
-                        result = None
+                if not use_api and new_coins_per_year == 0 and value_locked == 0:
+                    # Manual mode needs at least one value
+                    st.warning("⚠️ Please enter values for manual data entry or enable API fetching.")
+                    result = None
                 else:
-                    # Use manual data
-                    if new_coins_per_year == 0 and value_locked == 0:
-                        st.warning("⚠️ Please enter values for manual data entry or enable API fetching.")
-                        result = None
-                    else:
-                        result = run_undervalued_test(
-                            crypto_name=crypto_name,
-                            new_coins_per_year=new_coins_per_year,
-                            value_locked=value_locked
-                        )
+                    # Identical inputs within 5 minutes are served from cache
+                    result = _run_crypto_analysis(
+                        crypto_name,
+                        use_api,
+                        new_coins_per_year,
+                        value_locked,
+                        _api_key_digest(os.getenv("COINGECKO_API_KEY"))
+                    )
+                    if result is None:
+                        st.error(f"Could not fetch data for {crypto_name}. Please try manual entry.")
 
                 # Display results
                 if result:
@@ -185,11 +300,18 @@ def crypto_analysis_page():
                         for reason in reasoning:
                             st.markdown(f"- {reason}")
 
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+            except ConnectionError as e:
+                st.error(f"❌ Could not reach the data provider: {str(e)}")
+                st.info("Check your connection or try manual data entry.")
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
-                st.exception(e)
+                if DEBUG:
+                    st.exception(e)
 
 
+@st.fragment
 def property_analysis_page():
     """Dubai property valuation interface"""
     st.header("🏠 Dubai Property Valuation Analysis")
@@ -207,16 +329,13 @@ def property_analysis_page():
 
         area = st.selectbox(
             "Area",
-            options=[
-                "Dubai Marina", "Downtown Dubai", "JBR", "Palm Jumeirah",
-                "Business Bay", "DIFC", "JVC", "Sports City", "Discovery Gardens"
-            ],
+            options=DUBAI_AREAS,
             help="Select the property area"
         )
 
         property_type = st.selectbox(
             "Property Type",
-            options=["Apartment", "Villa", "Townhouse", "Penthouse", "Studio"],
+            options=PROPERTY_TYPES,
             help="Select the property type"
         )
 
@@ -261,13 +380,13 @@ def property_analysis_page():
     if st.button("🔍 Analyze Property", type="primary", use_container_width=True):
         with st.spinner("Analyzing property..."):
             try:
-                result = analyze_dubai_property(
-                    area=area,
-                    property_type=property_type,
-                    bedrooms=bedrooms,
-                    size_sqft=size_sqft,
-                    asking_price_aed=asking_price,
-                    use_api=use_api
+                result = _run_property_analysis(
+                    area,
+                    property_type,
+                    bedrooms,
+                    size_sqft,
+                    asking_price,
+                    use_api
                 )
 
                 if result:
@@ -344,9 +463,11 @@ def property_analysis_page():
 
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
-                st.exception(e)
+                if DEBUG:
+                    st.exception(e)
 
 
+@st.fragment
 def demo_mode_page():
     """Demo mode with sample data"""
     st.header("🎮 Demo Mode")
@@ -375,6 +496,8 @@ def demo_mode_page():
         if st.button("Run Crypto Demo", type="primary"):
             with st.spinner("Running demo..."):
                 try:
+                    from crypto_module.undervalued_test import run_undervalued_test
+
                     result = run_undervalued_test(
                         crypto_name="Zcash",
                         new_coins_per_year=1200000,
@@ -408,6 +531,8 @@ def demo_mode_page():
         if st.button("Run Property Demo", type="primary"):
             with st.spinner("Running demo..."):
                 try:
+                    from dubai_property_module.property_analyzer import analyze_dubai_property
+
                     result = analyze_dubai_property(
                         area="Dubai Marina",
                         property_type="Apartment",
@@ -429,6 +554,7 @@ def demo_mode_page():
                     st.error(f"Demo error: {str(e)}")
 
 
+@st.fragment
 def about_page():
     """About page with information"""
     st.header("ℹ️ About OUVC")
@@ -475,7 +601,7 @@ def about_page():
     ## Setup
 
     ### Requirements
-    - Python 3.7+
+    - Python 3.10+
     - API Keys (optional):
         - CoinGecko API (free tier available)
         - Bayut API via RapidAPI (free tier available)
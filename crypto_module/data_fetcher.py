@@ -3,9 +3,235 @@ Crypto Data Fetcher Module
 Handles API connections and data retrieval for cryptocurrency analysis
 """
 
+import diskcache
+import orjson
 import requests
-from typing import Dict, Optional
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+from crypto_module.undervalued_test import run_undervalued_test
+from shared_utils.helpers import RateLimiter
+
+
+# On-disk cache for fetched coin data; CoinGecko market data only
+# refreshes about once a minute
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "coingecko"
+COIN_DATA_TTL = 60
+
+# DeFiLlama TVL and protocol metadata move slowly; cache them for 5 minutes
+DEFILLAMA_TTL = 300
+
+# How long a protocol's ETag is kept for conditional revalidation once its
+# DEFILLAMA_TTL entry has expired
+PROTOCOL_ETAG_TTL = 24 * 60 * 60
+
+# CoinGecko /coins/markets accepts up to 250 ids per page
+MARKETS_PAGE_SIZE = 250
+
+# Fixed /coins/markets query flags; only the market fields we keep are
+# requested (no sparkline series, no extra price-change windows)
+_MARKETS_PARAMS = MappingProxyType({
+    "vs_currency": "usd",
+    "per_page": MARKETS_PAGE_SIZE,
+    "page": 1,
+    "sparkline": "false",
+})
+
+# Upper bound on simultaneous DeFiLlama TVL lookups
+MAX_CONCURRENT_FETCHES = 8
+
+# Requests per minute allowed per API host, looked up by domain so public
+# and pro hosts of the same API both match; callers wait for a free slot
+# instead of tripping 429s and sitting in retry backoff
+_DOMAIN_RATE_LIMITS = {
+    "coingecko.com": 30,
+    "llama.fi": 300,
+}
+DEFAULT_RATE_LIMIT = 60
+
+
+# TVL estimation multipliers (% of market cap typically locked)
+_TVL_MULTIPLIERS = {
+    # Privacy coins - based on shielded pool usage
+    'zcash': 0.05,  # ~5% in shielded pools
+    'monero': 0.80,  # Most XMR is private by default
+
+    # Smart contract platforms with staking
+    'ethereum': 0.25,  # Staked + DeFi locked
+    'cardano': 0.65,  # High staking rate
+    'solana': 0.70,   # High staking rate
+    'polkadot': 0.55, # High staking rate
+    'avalanche': 0.60,
+    'algorand': 0.65,
+    'tezos': 0.70,
+    'cosmos': 0.65,
+    'near': 0.60,
+    'fantom': 0.50,
+    'harmony': 0.45,
+    'elrond': 0.60,
+    'zilliqa': 0.50,
+
+    # Layer 2s (use parent chain TVL)
+    'polygon': 0.30,
+    'arbitrum': 0.20,
+    'optimism': 0.20,
+
+    # Bitcoin - conservative (long-term holders)
+    'bitcoin': 0.50,
+
+    # Oracles & infrastructure
+    'chainlink': 0.40,
+    'theta': 0.45,
+    'vechain': 0.35,
+    'hedera': 0.40,
+}
+
+
+# CoinGecko ids with no DeFiLlama protocol; TVL for these is always estimated
+_NO_TVL_COINS = frozenset({
+    'bitcoin', 'zcash', 'monero', 'dogecoin', 'ripple', 'litecoin',
+    'shiba-inu', 'tether', 'usd-coin', 'binancecoin',
+})
+
+
+# Mapping of common crypto names to their DeFi protocol slugs
+_PROTOCOL_MAP = {
+    # Layer 1s with DeFi ecosystems
+    'ethereum': 'ethereum',
+    'eth': 'ethereum',
+    'bitcoin': 'bitcoin',
+    'btc': 'bitcoin',
+    'solana': 'solana',
+    'sol': 'solana',
+    'cardano': 'cardano',
+    'ada': 'cardano',
+    'avalanche': 'avalanche',
+    'avax': 'avalanche',
+    'polkadot': 'polkadot',
+    'dot': 'polkadot',
+    'polygon': 'polygon',
+    'matic': 'polygon',
+    'cosmos': 'cosmos',
+    'atom': 'cosmos',
+    'algorand': 'algorand',
+    'algo': 'algorand',
+    'tezos': 'tezos',
+    'xtz': 'tezos',
+    'near protocol': 'near',
+    'near': 'near',
+    'fantom': 'fantom',
+    'ftm': 'fantom',
+    'harmony': 'harmony',
+    'one': 'harmony',
+    'elrond': 'multiversx',
+    'egld': 'multiversx',
+    'multiversx': 'multiversx',
+    'zilliqa': 'zilliqa',
+    'zil': 'zilliqa',
+
+    # Major DeFi Protocols
+    'aave': 'aave',
+    'uniswap': 'uniswap',
+    'compound': 'compound',
+    'makerdao': 'makerdao',
+    'maker': 'makerdao',
+    'curve': 'curve',
+    'lido': 'lido',
+    'pancakeswap': 'pancakeswap',
+    'sushiswap': 'sushi',
+    'balancer': 'balancer',
+    'yearn': 'yearn-finance',
+    'synthetix': 'synthetix',
+    'convex': 'convex-finance',
+    'rocket pool': 'rocket-pool',
+    'frax': 'frax',
+
+    # Layer 2s
+    'arbitrum': 'arbitrum',
+    'optimism': 'optimism',
+    'base': 'base',
+
+    # Privacy coins (note: these may not have TVL)
+    'zcash': 'zcash',
+    'zec': 'zcash',
+    'monero': 'monero',
+    'xmr': 'monero',
+
+    # Oracles
+    'chainlink': 'chainlink',
+    'link': 'chainlink',
+
+    # Other popular protocols
+    'gmx': 'gmx',
+    'thorchain': 'thorchain',
+    'osmosis': 'osmosis',
+    'jito': 'jito',
+    'kamino': 'kamino',
+}
+
+
+def _build_session() -> requests.Session:
+    """Pooled session that retries throttled and failed requests with backoff"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    ))
+    return session
+
+
+# HTTP connection pools shared by all CryptoDataFetcher instances, so
+# short-lived fetchers (one per CLI analysis) still reuse open connections
+_SESSION = _build_session()
+_POOL = urllib3.PoolManager(maxsize=MAX_CONCURRENT_FETCHES)
+
+# Worker pool for overlapping independent requests, shared the same way so
+# per-analysis fetchers don't each leave a pool of idle threads behind
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES)
+
+# One handle on the on-disk cache; diskcache is thread- and process-safe,
+# so every fetcher shares it instead of opening its own SQLite connection
+_CACHE = diskcache.Cache(str(CACHE_DIR))
+
+# Process-wide limiter per host, created on first request to it;
+# RateLimiter isn't thread-safe, so each one is used under its own lock.
+# Only the first attempt is counted: retries made by the session's
+# Retry(status_forcelist=[429, ...]) happen inside the adapter and bypass
+# the limiter.
+_RATE_LIMITERS: Dict[str, Tuple[RateLimiter, threading.Lock]] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _throttle(url: str) -> None:
+    """Block until another request to url's host fits within its rate limit"""
+    host = urlparse(url).hostname or ""
+    with _RATE_LIMITERS_LOCK:
+        entry = _RATE_LIMITERS.get(host)
+        if entry is None:
+            limit = next(
+                (limit for domain, limit in _DOMAIN_RATE_LIMITS.items()
+                 if host == domain or host.endswith("." + domain)),
+                DEFAULT_RATE_LIMIT
+            )
+            entry = _RATE_LIMITERS[host] = (RateLimiter(limit), threading.Lock())
+    limiter, lock = entry
+    with lock:
+        limiter.wait_if_needed()
 
 
 class CryptoDataFetcher:
@@ -22,7 +248,27 @@ class CryptoDataFetcher:
             # CoinGecko uses x-cg-demo-api-key header for free tier
             # and x-cg-pro-api-key for pro tier
             self.headers["x-cg-demo-api-key"] = self.coingecko_api_key
-    
+
+        # Module-wide session so keep-alive reuses TCP/TLS connections
+        # across every fetcher instance. CoinGecko headers are passed per
+        # request so the API key is never sent to DeFiLlama.
+        self.session = _SESSION
+
+        # Shared across processes and restarts, entries expire after the TTL
+        self.cache = _CACHE
+
+        # Bare urllib3 pool for the scalar DeFiLlama TVL endpoint, where the
+        # requests wrappers cost more than parsing the one-number body
+        self.pool = _POOL
+
+        # Module-wide worker pool for overlapping independent requests
+        self._executor = _EXECUTOR
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET url on the shared session once its host's rate limit allows"""
+        _throttle(url)
+        return self.session.get(url, **kwargs)
+
     def get_coin_data(self, coin_id: str) -> Dict:
         """
         Pulls price, supply, volume from CoinGecko and TVL from DeFiLlama
@@ -32,52 +278,145 @@ class CryptoDataFetcher:
 
         Returns:
             dict: Market data for the cryptocurrency including TVL
+
+        Raises:
+            ValueError: CoinGecko rejected the request or the coin was not found
+            ConnectionError: The request to CoinGecko failed
         """
-        # Normalize the coin_id to match CoinGecko's expected format
-        normalized_coin_id = get_coin_id(coin_id)
-        url = f"{self.coingecko_base}/coins/{normalized_coin_id}"
+        result = self.get_coin_data_many([coin_id])[coin_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_coin_data_many(self, coin_ids: Iterable[str]) -> Dict[str, Union[Dict, Exception]]:
+        """
+        Fetch data for several coins with a single CoinGecko request
+
+        Market data for all coins comes from one /coins/markets call, while
+        the DeFiLlama TVL lookups run concurrently on the worker pool.
+
+        Args:
+            coin_ids: Coin names or ids, as accepted by get_coin_id
+
+        Returns:
+            dict: Input id -> coin data, or the exception raised for that coin
+        """
+        results = {}
+        pending = {}
+        for cid in dict.fromkeys(coin_ids):
+            normalized_coin_id = get_coin_id(cid)
+            cached = self.cache.get(normalized_coin_id)
+            if cached is not None:
+                results[cid] = cached
+            else:
+                pending[cid] = normalized_coin_id
+
+        if not pending:
+            return results
+
+        # DeFiLlama has nothing for _NO_TVL_COINS, so skip their round-trips
+        tvl_futures = {
+            cid: self._executor.submit(self.get_tvl_data, cid)
+            for cid, normalized_coin_id in pending.items()
+            if normalized_coin_id not in _NO_TVL_COINS
+        }
 
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            if resp.status_code == 403:
-                raise ValueError(
-                    f"CoinGecko API access denied. "
-                    f"Please set up your COINGECKO_API_KEY in secure_config/api_keys.env. "
-                    f"Get a free API key at: https://www.coingecko.com/en/api"
-                )
-            elif resp.status_code == 404:
-                raise ValueError(f"Coin '{normalized_coin_id}' not found!")
-            elif resp.status_code != 200:
-                raise ValueError(
-                    f"CoinGecko API error (status {resp.status_code}): {resp.text[:200]}"
-                )
-
-            data = resp.json()
-            coin_data = {
-                "name": data["name"],
-                "symbol": data["symbol"].upper(),
-                "price": data["market_data"]["current_price"]["usd"],
-                "circulating": data["market_data"]["circulating_supply"],
-                "max_supply": data["market_data"].get("max_supply"),
-                "total_supply": data["market_data"]["total_supply"],
-                "volume_24h": data["market_data"]["total_volume"]["usd"],
-                "market_cap": data["market_data"]["market_cap"]["usd"],
-                "price_change_24h": data["market_data"]["price_change_percentage_24h"],
-                "last_updated": data["last_updated"]
-            }
-
-            # Try to fetch TVL data from DeFiLlama
-            tvl = self.get_tvl_data(coin_id)
+            markets = self._fetch_markets(list(dict.fromkeys(pending.values())))
+        except (ValueError, ConnectionError) as e:
+            for cid in pending:
+                results[cid] = e
+            return results
+
+        for cid, normalized_coin_id in pending.items():
+            if normalized_coin_id not in markets:
+                results[cid] = ValueError(f"Coin '{normalized_coin_id}' not found!")
+                continue
+
+            coin_data = dict(markets[normalized_coin_id])
+            tvl = tvl_futures[cid].result() if cid in tvl_futures else None
+
+            # Use TVL data from DeFiLlama when available
             if tvl:
                 coin_data["value_locked"] = tvl
             else:
                 # If no TVL found, estimate based on market cap for certain coins
                 coin_data["value_locked"] = self._estimate_tvl(coin_data)
 
-            return coin_data
+            self.cache.set(normalized_coin_id, coin_data, expire=COIN_DATA_TTL)
+            results[cid] = coin_data
+
+        return results
+
+    def _fetch_markets(self, coin_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch market data from CoinGecko /coins/markets, up to 250 ids per request
+
+        Args:
+            coin_ids: Normalized CoinGecko ids
+
+        Returns:
+            dict: CoinGecko id -> market data (ids CoinGecko doesn't know are absent)
+        """
+        url = f"{self.coingecko_base}/coins/markets"
+        markets = {}
+
+        for start in range(0, len(coin_ids), MARKETS_PAGE_SIZE):
+            batch = coin_ids[start:start + MARKETS_PAGE_SIZE]
+            params = {**_MARKETS_PARAMS, "ids": ",".join(batch)}
+
+            try:
+                # Stream so error/throttle bodies are never downloaded
+                with self._get(url, params=params, headers=self.headers,
+                               timeout=10, stream=True) as resp:
+                    if resp.status_code == 403:
+                        raise ValueError(
+                            f"CoinGecko API access denied. "
+                            f"Please set up your COINGECKO_API_KEY in secure_config/api_keys.env. "
+                            f"Get a free API key at: https://www.coingecko.com/en/api"
+                        )
+                    elif resp.status_code != 200:
+                        raise ValueError(
+                            f"CoinGecko API error (status {resp.status_code} {resp.reason})"
+                        )
+
+                    rows = orjson.loads(resp.content)
+
+            except requests.RequestException as e:
+                raise ConnectionError(f"Failed to fetch data for {', '.join(batch)}: {e}") from e
+
+            for row in rows:
+                markets[row["id"]] = {
+                    "name": row["name"],
+                    "symbol": row["symbol"].upper(),
+                    "price": row["current_price"],
+                    "circulating": row["circulating_supply"],
+                    "max_supply": row.get("max_supply"),
+                    "total_supply": row["total_supply"],
+                    "volume_24h": row["total_volume"],
+                    "market_cap": row["market_cap"],
+                    "price_change_24h": row["price_change_percentage_24h"],
+                    "last_updated": row["last_updated"]
+                }
+
+        return markets
+
+    def screen(self, coin_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Run the undervalued test over a list of coins
+
+        Args:
+            coin_ids: Coin names or ids, as accepted by get_coin_data
 
-        except Exception as e:
-            raise Exception(f"Failed to fetch data for {normalized_coin_id}: {str(e)}")
+        Returns:
+            dict: Input id -> undervalued test result, for coins that could be fetched
+        """
+        fetched = self.get_coin_data_many(coin_ids)
+        return {
+            cid: run_undervalued_test(crypto_name=cid, coin_data=data)
+            for cid, data in fetched.items()
+            if not isinstance(data, Exception)
+        }
 
     def _estimate_tvl(self, coin_data: Dict) -> float:
         """
@@ -91,48 +430,17 @@ class CryptoDataFetcher:
             float: Estimated TVL in USD
         """
         name = coin_data.get("name", "").lower()
-        symbol = coin_data.get("symbol", "").upper()
+        symbol = coin_data.get("symbol", "").lower()
         market_cap = coin_data.get("market_cap", 0)
 
-        # TVL estimation multipliers (% of market cap typically locked)
-        tvl_multipliers = {
-            # Privacy coins - based on shielded pool usage
-            'zcash': 0.05,  # ~5% in shielded pools
-            'monero': 0.80,  # Most XMR is private by default
-
-            # Smart contract platforms with staking
-            'ethereum': 0.25,  # Staked + DeFi locked
-            'cardano': 0.65,  # High staking rate
-            'solana': 0.70,   # High staking rate
-            'polkadot': 0.55, # High staking rate
-            'avalanche': 0.60,
-            'algorand': 0.65,
-            'tezos': 0.70,
-            'cosmos': 0.65,
-            'near': 0.60,
-            'fantom': 0.50,
-            'harmony': 0.45,
-            'elrond': 0.60,
-            'zilliqa': 0.50,
-
-            # Layer 2s (use parent chain TVL)
-            'polygon': 0.30,
-            'arbitrum': 0.20,
-            'optimism': 0.20,
-
-            # Bitcoin - conservative (long-term holders)
-            'bitcoin': 0.50,
-
-            # Oracles & infrastructure
-            'chainlink': 0.40,
-            'theta': 0.45,
-            'vechain': 0.35,
-            'hedera': 0.40,
-        }
+        # Exact symbol/name matches are a single dict lookup
+        multiplier = _TVL_MULTIPLIERS.get(symbol) or _TVL_MULTIPLIERS.get(name)
+        if multiplier:
+            return market_cap * multiplier
 
-        # Try to match by name or symbol
-        for key, multiplier in tvl_multipliers.items():
-            if key in name or key == symbol.lower():
+        # Fall back to matching a known key inside the coin name
+        for key, multiplier in _TVL_MULTIPLIERS.items():
+            if key in name:
                 return market_cap * multiplier
 
         # Default: 10% for unknown coins
@@ -155,13 +463,21 @@ class CryptoDataFetcher:
             if not protocol_slug:
                 return None
 
-            # Get TVL from DeFiLlama
+            cache_key = ("tvl", protocol_slug)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Get TVL from DeFiLlama via the per-protocol endpoint, whose body is
+            # a bare number; the bulk /protocols list is left to get_all_tvls
             url = f"{self.defillama_base}/api/tvl/{protocol_slug}"
-            resp = requests.get(url, timeout=10)
+            _throttle(url)
+            resp = self.pool.request("GET", url, timeout=10)
 
-            if resp.status_code == 200:
+            if resp.status == 200:
                 # Response is just a number
-                tvl = float(resp.text)
+                tvl = float(resp.data)
+                self.cache.set(cache_key, tvl, expire=DEFILLAMA_TTL)
                 return tvl
             else:
                 return None
@@ -169,6 +485,51 @@ class CryptoDataFetcher:
         except Exception:
             return None
 
+    def get_tvl_data_many(self, protocol_names: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch TVL for several protocols concurrently on the worker pool
+
+        Args:
+            protocol_names: Protocol names, as accepted by get_tvl_data
+
+        Returns:
+            dict: Protocol name -> TVL in USD, or None if not found
+        """
+        futures = {
+            name: self._executor.submit(self.get_tvl_data, name)
+            for name in dict.fromkeys(protocol_names)
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def get_all_tvls(self) -> Dict[str, float]:
+        """
+        Fetches the TVL of every DeFiLlama protocol with one /protocols call
+
+        Returns:
+            dict: Protocol slug -> TVL in USD, or an empty dict on failure
+        """
+        cache_key = ("protocols",)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            url = f"{self.defillama_base}/api/protocols"
+            with self._get(url, timeout=10, stream=True) as resp:
+                if resp.status_code != 200:
+                    return {}
+                data = orjson.loads(resp.content)
+        except Exception:
+            return {}
+
+        tvls = {
+            p['slug']: float(p['tvl'])
+            for p in data
+            if p.get('slug') and p.get('tvl') is not None
+        }
+        self.cache.set(cache_key, tvls, expire=DEFILLAMA_TTL)
+        return tvls
+
     def get_protocol_info(self, protocol_name: str) -> Optional[Dict]:
         """
         Fetches detailed protocol information from DeFiLlama
@@ -185,12 +546,27 @@ class CryptoDataFetcher:
             if not protocol_slug:
                 return None
 
-            url = f"{self.defillama_base}/api/protocol/{protocol_slug}"
-            resp = requests.get(url, timeout=10)
+            cache_key = ("protocol", protocol_slug)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            if resp.status_code == 200:
-                data = resp.json()
-                return {
+            # Revalidate with the last ETag; an unchanged protocol comes back
+            # as a body-less 304
+            etag_key = ("protocol_etag", protocol_slug)
+            validated = self.cache.get(etag_key)
+            headers = {"If-None-Match": validated[0]} if validated else None
+
+            url = f"{self.defillama_base}/api/protocol/{protocol_slug}"
+            resp = self._get(url, headers=headers, timeout=10)
+
+            if resp.status_code == 304 and validated:
+                info = validated[1]
+                self.cache.set(cache_key, info, expire=DEFILLAMA_TTL)
+                return info
+            elif resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                info = {
                     'name': data.get('name'),
                     'symbol': data.get('symbol'),
                     'tvl': data.get('tvl'),
@@ -200,13 +576,20 @@ class CryptoDataFetcher:
                     'description': data.get('description'),
                     'url': data.get('url')
                 }
+                self.cache.set(cache_key, info, expire=DEFILLAMA_TTL)
+                etag = resp.headers.get("ETag")
+                if etag:
+                    self.cache.set(etag_key, (etag, info), expire=PROTOCOL_ETAG_TTL)
+                return info
             else:
                 return None
 
         except Exception:
             return None
 
-    def _get_protocol_slug(self, protocol_name: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_protocol_slug(protocol_name: str) -> Optional[str]:
         """
         Convert user-friendly protocol name to DeFiLlama slug
 
@@ -216,87 +599,12 @@ class CryptoDataFetcher:
         Returns:
             str: DeFiLlama protocol slug, or None if not found
         """
-        # Mapping of common crypto names to their DeFi protocol slugs
-        protocol_map = {
-            # Layer 1s with DeFi ecosystems
-            'ethereum': 'ethereum',
-            'eth': 'ethereum',
-            'bitcoin': 'bitcoin',
-            'btc': 'bitcoin',
-            'solana': 'solana',
-            'sol': 'solana',
-            'cardano': 'cardano',
-            'ada': 'cardano',
-            'avalanche': 'avalanche',
-            'avax': 'avalanche',
-            'polkadot': 'polkadot',
-            'dot': 'polkadot',
-            'polygon': 'polygon',
-            'matic': 'polygon',
-            'cosmos': 'cosmos',
-            'atom': 'cosmos',
-            'algorand': 'algorand',
-            'algo': 'algorand',
-            'tezos': 'tezos',
-            'xtz': 'tezos',
-            'near protocol': 'near',
-            'near': 'near',
-            'fantom': 'fantom',
-            'ftm': 'fantom',
-            'harmony': 'harmony',
-            'one': 'harmony',
-            'elrond': 'multiversx',
-            'egld': 'multiversx',
-            'multiversx': 'multiversx',
-            'zilliqa': 'zilliqa',
-            'zil': 'zilliqa',
-
-            # Major DeFi Protocols
-            'aave': 'aave',
-            'uniswap': 'uniswap',
-            'compound': 'compound',
-            'makerdao': 'makerdao',
-            'maker': 'makerdao',
-            'curve': 'curve',
-            'lido': 'lido',
-            'pancakeswap': 'pancakeswap',
-            'sushiswap': 'sushi',
-            'balancer': 'balancer',
-            'yearn': 'yearn-finance',
-            'synthetix': 'synthetix',
-            'convex': 'convex-finance',
-            'rocket pool': 'rocket-pool',
-            'frax': 'frax',
-
-            # Layer 2s
-            'arbitrum': 'arbitrum',
-            'optimism': 'optimism',
-            'base': 'base',
-
-            # Privacy coins (note: these may not have TVL)
-            'zcash': 'zcash',
-            'zec': 'zcash',
-            'monero': 'monero',
-            'xmr': 'monero',
-
-            # Oracles
-            'chainlink': 'chainlink',
-            'link': 'chainlink',
-
-            # Other popular protocols
-            'gmx': 'gmx',
-            'thorchain': 'thorchain',
-            'osmosis': 'osmosis',
-            'jito': 'jito',
-            'kamino': 'kamino',
-        }
-
         normalized = protocol_name.lower().strip()
-        return protocol_map.get(normalized, normalized)
+        return _PROTOCOL_MAP.get(normalized, normalized)
 
 
-# Coin mapping for user-friendly input
-COIN_MAP = {
+# Coin mapping for user-friendly input (read-only)
+COIN_MAP = MappingProxyType({
     # Bitcoin & Forks
     "btc": "bitcoin", "bitcoin": "bitcoin",
     "bch": "bitcoin-cash", "bitcoincash": "bitcoin-cash",
@@ -323,7 +631,7 @@ COIN_MAP = {
     
     # DeFi
     "uni": "uniswap", "uniswap": "uniswap",
-    "aave": "aave", "aave": "aave",
+    "aave": "aave",
     
     # Meme Coins
     "doge": "dogecoin", "dogecoin": "dogecoin",
@@ -332,10 +640,14 @@ COIN_MAP = {
     # Payments
     "xrp": "ripple", "ripple": "ripple",
     "ltc": "litecoin", "litecoin": "litecoin",
-}
+})
+
+# Lookup table keyed exactly as get_coin_id normalizes its input
+_COIN_MAP_NORMALIZED = {k.strip().lower(): v for k, v in COIN_MAP.items()}
 
 
+@lru_cache(maxsize=256)
 def get_coin_id(user_input: str) -> str:
     """Convert user input to CoinGecko ID"""
-    normalized = user_input.lower().strip()
-    return COIN_MAP.get(normalized, normalized)
\ No newline at end of file
+    normalized = user_input.strip().lower()
+    return _COIN_MAP_NORMALIZED.get(normalized, normalized)
\ No newline at end of file
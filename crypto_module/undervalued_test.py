@@ -3,16 +3,48 @@
 Core algorithm for quick cryptocurrency valuation
 """
 
-from typing import Dict, Optional
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
 
+import numpy as np
 
-def run_undervalued_test(crypto_name: str = None,
-                        new_coins_per_year: float = 0,
+
+# Signal thresholds: inflation above 3% / 10% is medium / high,
+# FDMC/value-locked ratio from 3x / 10x is fair value / overvalued
+_INFLATION_THRESHOLDS = (3, 10)
+_VALUATION_THRESHOLDS = (3, 10)
+_INFLATION_SIGNAL_NAMES = ("low_inflation", "medium_inflation", "high_inflation")
+_VALUATION_SIGNAL_NAMES = ("undervalued", "fair_value", "overvalued")
+
+
+__all__ = [
+    "run_undervalued_test",
+    "compute_metrics",
+    "score_batch",
+    "build_scorer",
+    "get_inflation_signal",
+    "get_valuation_signal",
+    "determine_verdict",
+    "generate_reasoning",
+    "get_auto_tvl",
+]
+
+
+def run_undervalued_test(crypto_name: Union[str, Dict, None] = None,
+                        new_coins_per_year: Union[float, Dict] = 0,
                         value_locked: float = 0,
                         coin_data: Optional[Dict] = None) -> Dict:
     """
     Performs the signature 60-second undervalued test
 
+    Works only from its arguments and never touches the network, so callers
+    holding fetched coin_data pay for no further requests.
+
+    Also accepts the legacy positional form
+    run_undervalued_test(coin_data, whitepaper_data), where whitepaper_data
+    holds "new_coins_per_year" and "value_locked_usd".
+
     Args:
         crypto_name: Name of cryptocurrency (optional)
         new_coins_per_year: Annual inflation in new coins (manual input)
@@ -23,6 +55,15 @@ def run_undervalued_test(crypto_name: str = None,
         dict: Analysis results with verdict
     """
 
+    if isinstance(crypto_name, dict):
+        # Legacy (coin_data, whitepaper_data) call; whitepaper figures win
+        coin_data, whitepaper_data = crypto_name, new_coins_per_year or {}
+        crypto_name = None
+        new_coins_per_year = whitepaper_data.get("new_coins_per_year", 0)
+        if "value_locked_usd" in whitepaper_data:
+            value_locked = whitepaper_data["value_locked_usd"]
+            coin_data = {**coin_data, "value_locked": value_locked}
+
     if not coin_data:
         # Manual mode - create minimal coin_data
         coin_data = {
@@ -33,31 +74,30 @@ def run_undervalued_test(crypto_name: str = None,
             "value_locked": value_locked
         }
 
-    price = coin_data.get("price", 0)
-    circulating = coin_data.get("circulating", 1)
-    max_supply = coin_data.get("max_supply") or coin_data.get("total_supply", circulating)
+    # Read every field once; the rest of the test works on locals
+    get = coin_data.get
+    name = get("name", crypto_name)
+    price = get("price", 0)
+    circulating = get("circulating", 1)
+    has_total_supply = "total_supply" in coin_data
+    total_supply = get("total_supply", circulating)
+    max_supply = get("max_supply") or total_supply
 
     # Get TVL - prioritize coin_data (from API) over manual input
-    value_locked_usd = coin_data.get("value_locked", value_locked)
+    value_locked_usd = get("value_locked", value_locked)
 
     # Calculate new coins per year if not provided
-    if new_coins_per_year == 0 and "circulating" in coin_data and "total_supply" in coin_data:
-        total = coin_data.get("total_supply", 0)
-        circ = coin_data.get("circulating", 1)
+    if new_coins_per_year == 0 and has_total_supply and "circulating" in coin_data:
         # Estimate annual inflation (very rough approximation)
-        if total > circ:
-            remaining = total - circ
+        if total_supply > circulating:
+            remaining = total_supply - circulating
             # Assume remaining supply unlocks over next 5 years
             new_coins_per_year = remaining / 5
     
-    # 1. Calculate Inflation Rate
-    inflation_rate = (new_coins_per_year / circulating) * 100 if circulating > 0 else 0
-    
-    # 2. Calculate Fully Diluted Market Cap
-    fdmc = price * max_supply if max_supply else None
-    
-    # 3. Calculate Value Locked Ratio
-    value_ratio = fdmc / value_locked_usd if fdmc and value_locked_usd > 0 else None
+    # 1-3. Inflation rate, fully diluted market cap and value locked ratio
+    inflation_rate, fdmc, value_ratio = compute_metrics(
+        price, circulating, max_supply, new_coins_per_year, value_locked_usd
+    )
     
     # 4. Generate Signals
     inflation_signal = get_inflation_signal(inflation_rate)
@@ -67,7 +107,7 @@ def run_undervalued_test(crypto_name: str = None,
     verdict = determine_verdict(inflation_signal, valuation_signal)
     
     return {
-        "coin_name": coin_data.get("name", crypto_name),
+        "coin_name": name,
         "price": price,
         "circulating_supply": circulating,
         "max_supply": max_supply,
@@ -89,28 +129,169 @@ def run_undervalued_test(crypto_name: str = None,
     }
 
 
+def compute_metrics(price: float,
+                    circulating: float,
+                    max_supply: Optional[float],
+                    new_coins_per_year: float,
+                    value_locked_usd: float) -> Tuple[float, Optional[float], Optional[float]]:
+    """
+    Pure numeric core of the undervalued test
+
+    Returns:
+        tuple: (inflation_rate %, fdmc or None, fdmc/value locked ratio or None)
+    """
+    # 1. Calculate Inflation Rate
+    inflation_rate = (new_coins_per_year / circulating) * 100 if circulating > 0 else 0
+
+    # 2. Calculate Fully Diluted Market Cap
+    fdmc = price * max_supply if max_supply else None
+
+    # 3. Calculate Value Locked Ratio
+    value_ratio = fdmc / value_locked_usd if fdmc and value_locked_usd > 0 else None
+
+    return inflation_rate, fdmc, value_ratio
+
+
+def score_batch(price: np.ndarray,
+                circulating: np.ndarray,
+                max_supply: np.ndarray,
+                new_coins_per_year: np.ndarray,
+                value_locked: np.ndarray,
+                total_supply: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Vectorized undervalued test over many coins at once
+
+    Same formulas and thresholds as run_undervalued_test, evaluated on
+    aligned arrays (one element per coin). A missing total supply (NaN, or
+    no total_supply array) falls back to circulating supply, and a missing
+    max supply (0 or NaN) to total supply, as in run_undervalued_test. Where
+    new_coins_per_year is 0 and a total supply is given, it is estimated
+    from the locked supply the same way.
+
+    Returns:
+        dict: Arrays for inflation_rate, fdmc, fdmc_to_value_locked (NaN when
+        unavailable), inflation_signal, valuation_signal and verdict
+    """
+    price = np.asarray(price, dtype=np.float64)
+    circulating = np.asarray(circulating, dtype=np.float64)
+    if total_supply is None:
+        total_supply = np.full_like(circulating, np.nan)
+    total_supply = np.asarray(total_supply, dtype=np.float64)
+    has_total_supply = ~np.isnan(total_supply)
+    total_supply = np.where(has_total_supply, total_supply, circulating)
+    max_supply = np.nan_to_num(np.asarray(max_supply, dtype=np.float64))
+    max_supply = np.where(max_supply != 0, max_supply, total_supply)
+    new_coins_per_year = np.asarray(new_coins_per_year, dtype=np.float64)
+    value_locked = np.asarray(value_locked, dtype=np.float64)
+
+    # Assume remaining supply unlocks over the next 5 years
+    estimate_unlocks = (new_coins_per_year == 0) & has_total_supply & (total_supply > circulating)
+    new_coins_per_year = np.where(estimate_unlocks, (total_supply - circulating) / 5, new_coins_per_year)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inflation_rate = np.where(circulating > 0, new_coins_per_year / circulating * 100, 0.0)
+        fdmc = np.where(max_supply != 0, price * max_supply, np.nan)
+        has_ratio = (np.nan_to_num(fdmc) != 0) & (value_locked > 0)
+        value_ratio = np.where(has_ratio, fdmc / value_locked, np.nan)
+
+    # Integer signal codes index into the signal names below; counting the
+    # thresholds passed matches get_inflation_signal/get_valuation_signal
+    inflation_code = sum(
+        (inflation_rate > t).astype(np.int8) for t in _INFLATION_THRESHOLDS
+    )
+    valuation_code = np.where(
+        has_ratio,
+        sum((value_ratio >= t).astype(np.int8) for t in _VALUATION_THRESHOLDS),
+        len(_VALUATION_SIGNAL_NAMES)  # insufficient_data
+    ).astype(np.int8)
+
+    return {
+        "inflation_rate": inflation_rate,
+        "fdmc": fdmc,
+        "fdmc_to_value_locked": value_ratio,
+        "inflation_signal": _INFLATION_SIGNALS[inflation_code],
+        "valuation_signal": _VALUATION_SIGNALS[valuation_code],
+        "verdict": _VERDICT_GRID[inflation_code, valuation_code],
+    }
+
+
+@lru_cache(maxsize=32)
+def build_scorer(inflation_thresholds: Tuple[float, float] = _INFLATION_THRESHOLDS,
+                 valuation_thresholds: Tuple[float, float] = _VALUATION_THRESHOLDS) -> Callable:
+    """
+    Build a scorer specialized to fixed signal thresholds
+
+    The returned function scores one coin given as a positional
+    (price, circulating, max_supply, total_supply, new_coins_per_year,
+    value_locked) tuple, with None for a missing total or max supply and
+    the same supply fallbacks as run_undervalued_test. Thresholds and the
+    verdict table are bound as locals. Meant for screening a large,
+    fixed-schema portfolio row by row.
+
+    Returns:
+        callable: row -> (inflation_rate, value_ratio or None,
+        inflation_signal, valuation_signal, verdict)
+    """
+    infl_medium, infl_high = inflation_thresholds
+    val_fair, val_over = valuation_thresholds
+    verdicts = _VERDICT_TABLE
+
+    def score(row: Tuple[float, float, Optional[float], Optional[float], float, float]) -> Tuple:
+        price, circulating, max_supply, total_supply, new_coins_per_year, value_locked = row
+
+        if total_supply is None:
+            total_supply = circulating
+        elif new_coins_per_year == 0 and total_supply > circulating:
+            # Assume remaining supply unlocks over the next 5 years
+            new_coins_per_year = (total_supply - circulating) / 5
+        max_supply = max_supply or total_supply
+
+        inflation_rate = (new_coins_per_year / circulating) * 100 if circulating > 0 else 0
+        fdmc = price * max_supply if max_supply else None
+        value_ratio = fdmc / value_locked if fdmc and value_locked > 0 else None
+
+        if inflation_rate > infl_high:
+            inflation_signal = "high_inflation"
+        elif inflation_rate > infl_medium:
+            inflation_signal = "medium_inflation"
+        else:
+            inflation_signal = "low_inflation"
+
+        if not value_ratio:
+            valuation_signal = "insufficient_data"
+        elif value_ratio < val_fair:
+            valuation_signal = "undervalued"
+        elif value_ratio < val_over:
+            valuation_signal = "fair_value"
+        else:
+            valuation_signal = "overvalued"
+
+        return (inflation_rate, value_ratio, inflation_signal, valuation_signal,
+                verdicts[inflation_signal, valuation_signal])
+
+    return score
+
+
 def get_inflation_signal(inflation_rate: float) -> str:
-    """Classify inflation rate"""
-    if inflation_rate > 10:
-        return "high_inflation"  # AVOID
-    elif inflation_rate > 3:
-        return "medium_inflation"  # CAUTION
-    else:
-        return "low_inflation"  # GOOD
+    """Classify inflation rate (low = GOOD, medium = CAUTION, high = AVOID)"""
+    return _INFLATION_SIGNAL_NAMES[bisect_left(_INFLATION_THRESHOLDS, inflation_rate)]
 
 
 def get_valuation_signal(value_ratio: float) -> str:
-    """Classify valuation based on FDMC/Value Locked ratio"""
-    if value_ratio < 3:
-        return "undervalued"  # BUY
-    elif value_ratio < 10:
-        return "fair_value"  # HOLD
-    else:
-        return "overvalued"  # AVOID
+    """Classify valuation based on FDMC/Value Locked ratio (undervalued = BUY, fair = HOLD, overvalued = AVOID)"""
+    return _VALUATION_SIGNAL_NAMES[bisect_right(_VALUATION_THRESHOLDS, value_ratio)]
 
 
 def determine_verdict(inflation_signal: str, valuation_signal: str) -> str:
     """Determine overall investment verdict"""
+    verdict = _VERDICT_TABLE.get((inflation_signal, valuation_signal))
+    if verdict is None:
+        verdict = _verdict_rules(inflation_signal, valuation_signal)
+    return verdict
+
+
+def _verdict_rules(inflation_signal: str, valuation_signal: str) -> str:
+    """Verdict decision rules, evaluated once per signal pair into _VERDICT_TABLE"""
     
     if inflation_signal == "high_inflation":
         return "AVOID - High Inflation"
@@ -174,4 +355,22 @@ def get_auto_tvl(coin_name: str, price: float) -> int:
     
     # Rough estimation - in production, use real APIs
     estimated_coins_locked = 10000000 * multiplier  # Placeholder
-    return int(estimated_coins_locked * price)
\ No newline at end of file
+    return int(estimated_coins_locked * price)
+
+
+# Verdict for every (inflation signal, valuation signal) pair, precomputed
+# from the decision rules
+_VERDICT_TABLE = {
+    (i, v): _verdict_rules(i, v)
+    for i in _INFLATION_SIGNAL_NAMES
+    for v in _VALUATION_SIGNAL_NAMES + ("insufficient_data",)
+}
+
+# Signal names by integer code and the same verdicts as a 2-D grid,
+# used by score_batch
+_INFLATION_SIGNALS = np.array(_INFLATION_SIGNAL_NAMES, dtype=object)
+_VALUATION_SIGNALS = np.array(_VALUATION_SIGNAL_NAMES + ("insufficient_data",), dtype=object)
+_VERDICT_GRID = np.array(
+    [[_VERDICT_TABLE[i, v] for v in _VALUATION_SIGNALS] for i in _INFLATION_SIGNALS],
+    dtype=object
+)
@@ -5,11 +5,15 @@ Advanced real estate valuation for Dubai market
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -65,8 +69,235 @@ AREA_YIELDS = {
     Area.DISCOVERY_GARDENS: {"min": 7.5, "avg": 9.0, "max": 11.0},
 }
 
+# Yield lookup keyed by the normalized area string, built once at import
+_AREA_YIELDS_BY_STR = {a.value: v for a, v in AREA_YIELDS.items()}
 
-@dataclass
+
+# Default rental ranges for different areas (AED per year)
+RENTAL_RANGES = {
+    "dubai-marina": {1: (80000, 120000), 2: (120000, 180000), 3: (180000, 280000)},
+    "downtown-dubai": {0: (60000, 90000), 1: (80000, 120000), 2: (130000, 200000)},
+    "business-bay": {1: (70000, 110000), 2: (110000, 170000), 3: (170000, 250000)},
+    "jvc": {1: (45000, 70000), 2: (70000, 110000), 3: (110000, 160000)},
+}
+
+# Rental ranges as [area index, bedrooms] arrays; -1 marks combinations
+# without data, which fall back to a per-sqft estimate
+_AREA_IDX = {a.value: i for i, a in enumerate(Area)}
+_MAX_RENTAL_BEDROOMS = max(br for ranges in RENTAL_RANGES.values() for br in ranges)
+_RENTAL_MIN = np.full((len(_AREA_IDX), _MAX_RENTAL_BEDROOMS + 1), -1.0)
+_RENTAL_MAX = np.full_like(_RENTAL_MIN, -1.0)
+for _area, _ranges in RENTAL_RANGES.items():
+    for _br, (_min, _max) in _ranges.items():
+        _RENTAL_MIN[_AREA_IDX[_area], _br] = _min
+        _RENTAL_MAX[_AREA_IDX[_area], _br] = _max
+del _area, _ranges, _br, _min, _max
+
+
+def estimate_rent(area_idx: np.ndarray,
+                  bedrooms: np.ndarray,
+                  size_sqft: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized annual rent range for many properties at once
+
+    Args:
+        area_idx: Area indices from _AREA_IDX (-1 for unknown areas)
+        bedrooms: Bedroom counts
+        size_sqft: Sizes, used for the 80 AED/sqft fallback estimate
+
+    Returns:
+        tuple: (min_rent, max_rent) arrays in AED per year
+    """
+    area_idx = np.asarray(area_idx, dtype=np.int64)
+    bedrooms = np.asarray(bedrooms, dtype=np.int64)
+    base_rent = np.asarray(size_sqft, dtype=np.float64) * 80
+
+    in_table = (area_idx >= 0) & (bedrooms >= 0) & (bedrooms < _RENTAL_MIN.shape[1])
+    rows = np.where(in_table, area_idx, 0)
+    cols = np.where(in_table, bedrooms, 0)
+    rents_min = np.where(in_table, _RENTAL_MIN[rows, cols], -1.0)
+    rents_max = np.where(in_table, _RENTAL_MAX[rows, cols], -1.0)
+
+    missing = rents_min < 0
+    min_rent = np.where(missing, base_rent * 0.8, rents_min)
+    max_rent = np.where(missing, base_rent * 1.2, rents_max)
+    return min_rent, max_rent
+
+
+# Average yield benchmark per area index; areas without data use 6%
+_AREA_YIELD_AVG = np.array([AREA_YIELDS.get(a, {"avg": 6.0})["avg"] for a in Area])
+
+# Verdict and confidence names by integer code, used by value_properties
+_BATCH_VERDICTS = np.array(["HOLD", "BUY", "STRONG BUY", "AVOID", "INSUFFICIENT DATA"], dtype=object)
+_BATCH_CONFIDENCE = np.array(["low", "medium", "high"], dtype=object)
+
+
+def value_properties(area_idx: np.ndarray,
+                     bedrooms: np.ndarray,
+                     sizes: np.ndarray,
+                     prices: np.ndarray,
+                     estimated_values: np.ndarray,
+                     comp_counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Vectorized valuation signals for many properties at once
+
+    Same rules as DubaiPropertyValuator.analyze_property, evaluated on
+    aligned arrays (one element per property). Properties with fewer than
+    3 comparables get NaN figures and an INSUFFICIENT DATA verdict.
+
+    Returns:
+        dict: Arrays for price_to_estimate_ratio, avg_annual_rent,
+        estimated_rental_yield, verdict and confidence
+    """
+    area_idx = np.asarray(area_idx, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    comp_counts = np.asarray(comp_counts, dtype=np.int64)
+    sufficient = comp_counts >= 3
+    estimated_values = np.where(sufficient, np.asarray(estimated_values, dtype=np.float64), np.nan)
+
+    min_rent, max_rent = estimate_rent(area_idx, bedrooms, sizes)
+    avg_rent = np.trunc((np.trunc(min_rent) + np.trunc(max_rent)) / 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = prices / estimated_values
+        yield_pct = avg_rent / estimated_values * 100
+
+    expected_yield = np.where(area_idx >= 0, _AREA_YIELD_AVG[np.maximum(area_idx, 0)], 6.0)
+    undervalued = ratio < 0.90
+    overvalued = ratio > 1.10
+    attractive = yield_pct > expected_yield * 1.1
+    low_yield = yield_pct < expected_yield * 0.9
+
+    verdict_code = np.select(
+        [~sufficient, undervalued & attractive, undervalued | attractive, overvalued | low_yield],
+        [4, 2, 1, 3],
+        default=0
+    )
+    confidence_code = (comp_counts >= 5).astype(np.int8) + (comp_counts > 10)
+
+    return {
+        "price_to_estimate_ratio": ratio,
+        "avg_annual_rent": avg_rent,
+        "estimated_rental_yield": yield_pct,
+        "verdict": _BATCH_VERDICTS[verdict_code],
+        "confidence": _BATCH_CONFIDENCE[confidence_code],
+    }
+
+
+# Comparable properties in column (structure-of-arrays) layout:
+# {"prices", "sizes"} -> aligned np.ndarray; only the columns the valuation
+# reads are kept, and both are converted inside _parse_properties' per-hit try
+Comparables = Dict[str, np.ndarray]
+
+
+def to_comparables(properties: List[Dict]) -> Comparables:
+    """Convert parsed property dicts into aligned column arrays"""
+    count = len(properties)
+    return {
+        "prices": np.fromiter((p["price"] for p in properties), dtype=np.float64, count=count),
+        "sizes": np.fromiter((p["size_sqft"] for p in properties), dtype=np.float64, count=count),
+    }
+
+
+# Realistic demo data based on Dubai market, used without API keys
+DEMO_PROPERTIES = (
+    {
+        "price": 1650000,
+        "size_sqft": 1150,
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "area": "dubai-marina",
+        "property_type": "apartment"
+    },
+    {
+        "price": 1820000,
+        "size_sqft": 1250,
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "area": "dubai-marina",
+        "property_type": "apartment"
+    },
+    {
+        "price": 1750000,
+        "size_sqft": 1200,
+        "bedrooms": 2,
+        "bathrooms": 2,
+        "area": "dubai-marina",
+        "property_type": "apartment"
+    },
+    {
+        "price": 850000,
+        "size_sqft": 480,
+        "bedrooms": 0,
+        "bathrooms": 1,
+        "area": "downtown-dubai",
+        "property_type": "studio"
+    },
+    {
+        "price": 820000,
+        "size_sqft": 450,
+        "bedrooms": 0,
+        "bathrooms": 1,
+        "area": "downtown-dubai",
+        "property_type": "studio"
+    },
+    {
+        "price": 905000,
+        "size_sqft": 510,
+        "bedrooms": 0,
+        "bathrooms": 1,
+        "area": "downtown-dubai",
+        "property_type": "studio"
+    },
+    {
+        "price": 640000,
+        "size_sqft": 740,
+        "bedrooms": 1,
+        "bathrooms": 1,
+        "area": "jvc",
+        "property_type": "apartment"
+    },
+    {
+        "price": 685000,
+        "size_sqft": 780,
+        "bedrooms": 1,
+        "bathrooms": 2,
+        "area": "jvc",
+        "property_type": "apartment"
+    },
+    {
+        "price": 610000,
+        "size_sqft": 715,
+        "bedrooms": 1,
+        "bathrooms": 1,
+        "area": "jvc",
+        "property_type": "apartment"
+    },
+)
+
+# Demo properties indexed by (bedrooms, property_type)
+_DEMO_BY_KEY = defaultdict(list)
+for _p in DEMO_PROPERTIES:
+    _DEMO_BY_KEY[_p["bedrooms"], _p["property_type"]].append(_p)
+_DEMO_BY_KEY = dict(_DEMO_BY_KEY)
+del _p
+
+
+def _frozen_comparables(properties: List[Dict]) -> Comparables:
+    """Column arrays for a fixed property list, marked read-only so they can be shared"""
+    comps = to_comparables(properties)
+    for column in comps.values():
+        column.flags.writeable = False
+    return comps
+
+
+# Up to 5 demo comparables per (bedrooms, property_type), converted to
+# column arrays once at import
+_DEMO_COMPARABLES = {key: _frozen_comparables(props[:5]) for key, props in _DEMO_BY_KEY.items()}
+_NO_DEMO_COMPARABLES = _frozen_comparables([])
+
+
+@dataclass(slots=True)
 class Property:
     """Property data model"""
     area: str
@@ -78,12 +309,40 @@ class Property:
     service_charge_sqft: Optional[float] = None
     furnished: Optional[bool] = None
     view_type: Optional[str] = None
+    # Derived from area once at construction
+    _expected_yield_avg: float = field(init=False, default=6.0, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if isinstance(self.area, str):
+            self.area = normalize_area(self.area)
+        self._expected_yield_avg = _AREA_YIELDS_BY_STR.get(self.area, {"avg": 6.0})["avg"]
     
     @property
     def price_per_sqft(self) -> float:
         return self.price_aed / self.size_sqft if self.size_sqft > 0 else 0
 
 
+def _build_session() -> requests.Session:
+    """Pooled session that retries throttled and failed requests with backoff"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    ))
+    return session
+
+
+# HTTP connection pool shared by all BayutClient instances, so the
+# per-call valuators built by analyze_dubai_property reuse open connections
+_BAYUT_SESSION = _build_session()
+
+
 class BayutClient:
     """Bayut API integration for property data"""
     
@@ -94,6 +353,10 @@ class BayutClient:
             "X-RapidAPI-Key": api_key,
             "X-RapidAPI-Host": "bayut-api1.p.rapidapi.com"
         }
+
+        # Module-wide session; RapidAPI headers are passed per request since
+        # each client may carry a different key
+        self.session = _BAYUT_SESSION
     
     def search_properties(self, 
                          area: str, 
@@ -103,7 +366,7 @@ class BayutClient:
                          max_price: float,
                          min_size: int,
                          max_size: int,
-                         purpose: str = "for-sale") -> List[Dict]:
+                         purpose: str = "for-sale") -> Comparables:
         """Search for comparable properties"""
         
         if self.api_key == "demo_mode":
@@ -123,61 +386,29 @@ class BayutClient:
         }
         
         try:
-            response = requests.get(
+            # Stream so error/throttle bodies are never downloaded
+            with self.session.get(
                 f"{self.base_url}/properties/list",
-                headers=self.headers,
                 params=params,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
+                headers=self.headers,
+                timeout=15,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    return to_comparables([])
                 data = response.json()
-                return self._parse_properties(data.get("hits", []))
-            else:
-                return []
+            
+            return self._parse_properties(data.get("hits", []))
                 
         except Exception:
-            return []
+            return to_comparables([])
     
-    def _get_demo_data(self, area: str, property_type: str, bedrooms: int) -> List[Dict]:
+    def _get_demo_data(self, area: str, property_type: str, bedrooms: int) -> Comparables:
         """Demo data for testing without API keys"""
-        
-        # Realistic demo data based on Dubai market
-        demo_properties = [
-            {
-                "price": 1650000,
-                "size_sqft": 1150,
-                "bedrooms": 2,
-                "bathrooms": 2,
-                "area": "dubai-marina",
-                "property_type": "apartment"
-            },
-            {
-                "price": 1820000,
-                "size_sqft": 1250,
-                "bedrooms": 2,
-                "bathrooms": 2,
-                "area": "dubai-marina",
-                "property_type": "apartment"
-            },
-            {
-                "price": 850000,
-                "size_sqft": 480,
-                "bedrooms": 0,
-                "bathrooms": 1,
-                "area": "downtown-dubai",
-                "property_type": "studio"
-            }
-        ]
-        
-        # Filter demo data to match request
-        filtered = [p for p in demo_properties 
-                   if p["bedrooms"] == bedrooms and p["property_type"] == property_type]
-        
-        return filtered[:5]  # Return up to 5 comparables
+        return _DEMO_COMPARABLES.get((bedrooms, property_type), _NO_DEMO_COMPARABLES)
     
-    def _parse_properties(self, hits: List[Dict]) -> List[Dict]:
-        """Parse Bayut response to property data"""
+    def _parse_properties(self, hits: List[Dict]) -> Comparables:
+        """Parse Bayut response to property data columns"""
         properties = []
         
         for hit in hits:
@@ -194,7 +425,7 @@ class BayutClient:
             except:
                 continue
         
-        return properties
+        return to_comparables(properties)
 
 
 class DubaiPropertyValuator:
@@ -217,11 +448,10 @@ class DubaiPropertyValuator:
         # Create target property
         # Normalize property_type to lowercase to match enum values
         property_type_normalized = property_type.lower() if isinstance(property_type, str) else property_type
-        # Normalize area to match enum format (lowercase with hyphens)
-        area_normalized = normalize_area(area) if isinstance(area, str) else area
 
+        # Area is normalized to the enum format in Property.__post_init__
         target = Property(
-            area=area_normalized,
+            area=area,
             property_type=PropertyType(property_type_normalized),
             bedrooms=bedrooms,
             bathrooms=kwargs.get("bathrooms", bedrooms),
@@ -234,8 +464,9 @@ class DubaiPropertyValuator:
         
         # Fetch comparables
         comps = self._fetch_comparables(target)
+        comp_count = len(comps["prices"])
         
-        if len(comps) < 3:
+        if comp_count < 3:
             return {
                 "error": "Insufficient comparable properties found",
                 "suggestion": "Try adjusting search criteria"
@@ -261,12 +492,54 @@ class DubaiPropertyValuator:
             "estimated_rental_yield": round(estimated_yield, 2),
             "rental_data": rental_data,
             "valuation_signals": signals,
-            "comparable_properties": len(comps),
-            "data_sources": {"bayut": len(comps)},
-            "market_insights": self._get_market_insights(area)
+            "comparable_properties": comp_count,
+            "data_sources": {"bayut": comp_count},
+            "market_insights": self._get_market_insights(target.area)
         }
     
-    def _fetch_comparables(self, target: Property) -> List[Dict]:
+    def analyze_batch(self,
+                      areas: List[str],
+                      property_types: List[str],
+                      bedrooms: np.ndarray,
+                      sizes: np.ndarray,
+                      prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Analyze many properties; comparables are fetched per property, the
+        valuation itself runs vectorized in value_properties
+        
+        Returns:
+            dict: Arrays for estimated_value and comparable_properties plus
+            everything value_properties returns
+        """
+        bedrooms = np.asarray(bedrooms, dtype=np.int64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        count = len(prices)
+        
+        area_idx = np.empty(count, dtype=np.int64)
+        estimated_values = np.empty(count, dtype=np.float64)
+        comp_counts = np.empty(count, dtype=np.int64)
+        
+        for i in range(count):
+            target = Property(
+                area=areas[i],
+                property_type=PropertyType(property_types[i].lower()),
+                bedrooms=int(bedrooms[i]),
+                bathrooms=int(bedrooms[i]),
+                size_sqft=int(sizes[i]),
+                price_aed=float(prices[i])
+            )
+            comps = self._fetch_comparables(target)
+            area_idx[i] = _AREA_IDX.get(target.area, -1)
+            comp_counts[i] = len(comps["prices"])
+            estimated_values[i] = self._calculate_valuation(target, comps)
+        
+        result = value_properties(area_idx, bedrooms, sizes, prices, estimated_values, comp_counts)
+        result["estimated_value"] = np.where(comp_counts >= 3, estimated_values, np.nan)
+        result["comparable_properties"] = comp_counts
+        return result
+    
+    def _fetch_comparables(self, target: Property) -> Comparables:
         """Fetch comparable properties"""
         radius_pct = 0.20
         
@@ -285,61 +558,62 @@ class DubaiPropertyValuator:
             max_size=int(max_size)
         )
     
-    def _calculate_valuation(self, target: Property, comps: List[Dict]) -> float:
+    def _calculate_valuation(self, target: Property, comps: Comparables) -> float:
         """Calculate estimated value using comparables"""
-        if not comps:
-            return target.price_aed
+        sizes = comps["sizes"]
+        mask = sizes > 0
         
-        # Simple average method (can be enhanced with ML later)
-        prices_per_sqft = [comp["price"] / comp["size_sqft"] 
-                          for comp in comps if comp["size_sqft"] > 0]
+        ppsqft = comps["prices"][mask] / sizes[mask]
+        ppsqft = ppsqft[np.isfinite(ppsqft) & (ppsqft > 0)]
         
-        if prices_per_sqft:
-            avg_price_per_sqft = np.mean(prices_per_sqft)
-            return avg_price_per_sqft * target.size_sqft
+        if not ppsqft.size:
+            return target.price_aed
         
-        return target.price_aed
+        # Median price per sqft, robust to outlier listings (can be enhanced with ML later)
+        return float(np.median(ppsqft)) * target.size_sqft
     
     def _get_rental_estimate(self, target: Property) -> Dict:
         """Estimate rental income based on area and type"""
         
-        # Default rental ranges for different areas (AED per year)
-        rental_ranges = {
-            "dubai-marina": {1: (80000, 120000), 2: (120000, 180000), 3: (180000, 280000)},
-            "downtown-dubai": {0: (60000, 90000), 1: (80000, 120000), 2: (130000, 200000)},
-            "business-bay": {1: (70000, 110000), 2: (110000, 170000), 3: (170000, 250000)},
-            "jvc": {1: (45000, 70000), 2: (70000, 110000), 3: (110000, 160000)},
+        min_rent, avg_rent, max_rent = self._rental_range(target.area, target.bedrooms, target.size_sqft)
+        
+        return {
+            "min_annual_rent": min_rent,
+            "avg_annual_rent": avg_rent,
+            "max_annual_rent": max_rent,
+            "last_updated": datetime.now().isoformat()
         }
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _rental_range(area: str, bedrooms: int, size_sqft: int) -> Tuple[int, int, int]:
+        """(min, avg, max) annual rent for an area, bedroom count and size"""
+        
+        area_idx = _AREA_IDX.get(area, -1)
+        min_rent = -1
         
-        area_key = target.area
-        bedrooms = target.bedrooms
+        if area_idx >= 0 and 0 <= bedrooms < _RENTAL_MIN.shape[1]:
+            min_rent = _RENTAL_MIN[area_idx, bedrooms]
+            max_rent = _RENTAL_MAX[area_idx, bedrooms]
         
-        if area_key in rental_ranges and bedrooms in rental_ranges[area_key]:
-            min_rent, max_rent = rental_ranges[area_key][bedrooms]
-        else:
+        if min_rent < 0:
             # Fallback estimates
-            base_rent = target.size_sqft * 80  # 80 AED per sqft per year
+            base_rent = size_sqft * 80  # 80 AED per sqft per year
             min_rent = base_rent * 0.8
             max_rent = base_rent * 1.2
         
         avg_rent = (min_rent + max_rent) / 2
         
-        return {
-            "min_annual_rent": int(min_rent),
-            "avg_annual_rent": int(avg_rent),
-            "max_annual_rent": int(max_rent),
-            "last_updated": datetime.now().isoformat()
-        }
+        return int(min_rent), int(avg_rent), int(max_rent)
     
     def _generate_signals(self, target: Property, estimated_value: float, 
-                         estimated_yield: float, comps: List[Dict]) -> Dict:
+                         estimated_yield: float, comps: Comparables) -> Dict:
         """Generate valuation signals and verdict"""
         
         ratio = target.price_aed / estimated_value
         
-        # Get area yield benchmark
-        area_enum = Area(target.area) if target.area in [a.value for a in Area] else None
-        expected_yield = AREA_YIELDS.get(area_enum, {"avg": 6.0})["avg"] if area_enum else 6.0
+        # Area yield benchmark, resolved when the property was built
+        expected_yield = target._expected_yield_avg
         
         signals = {
             "price_signal": "neutral",
@@ -374,9 +648,10 @@ class DubaiPropertyValuator:
             signals["overall_verdict"] = "AVOID"
         
         # Confidence based on comparables
-        if len(comps) > 10:
+        comp_count = len(comps["prices"])
+        if comp_count > 10:
             signals["confidence"] = "high"
-        elif len(comps) < 5:
+        elif comp_count < 5:
             signals["confidence"] = "low"
         
         return signals
@@ -410,4 +685,18 @@ def analyze_dubai_property(**kwargs) -> Dict:
     valuator = DubaiPropertyValuator(bayut_key)
     
     # Run analysis
-    return valuator.analyze_property(**kwargs)
\ No newline at end of file
+    return valuator.analyze_property(**kwargs)
+
+
+def analyze_dubai_property_batch(areas: List[str],
+                                 property_types: List[str],
+                                 bedrooms: np.ndarray,
+                                 sizes: np.ndarray,
+                                 prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Analyze many Dubai properties at once (aligned sequences, one entry per property)
+    
+    See DubaiPropertyValuator.analyze_batch for the returned arrays.
+    """
+    bayut_key = os.getenv("BAYUT_API_KEY", "demo_mode")
+    return DubaiPropertyValuator(bayut_key).analyze_batch(areas, property_types, bedrooms, sizes, prices)
@@ -8,13 +8,26 @@ import sys
 import os
 from pathlib import Path
 
+import pandas as pd
+
 # Add modules to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from shared_utils.secrets_manager import load_secrets, get_secret
 from crypto_module.data_fetcher import CryptoDataFetcher, get_coin_id
 from crypto_module.undervalued_test import run_undervalued_test
-from dubai_property_module.property_analyzer import analyze_dubai_property
+from dubai_property_module.property_analyzer import (
+    analyze_dubai_property, analyze_dubai_property_batch, Area, PropertyType
+)
+from shared_utils.helpers import parse_user_input
+
+# Known areas and property types, checked before any API call
+_VALID_AREAS = frozenset(a.value for a in Area)
+_VALID_TYPES = frozenset(t.value for t in PropertyType)
+
+# Numeric CSV columns for batch analysis; the integer ones must be whole numbers
+_NUMERIC_COLUMNS = ("bedrooms", "size_sqft", "asking_price_aed")
+_INTEGER_COLUMNS = ("bedrooms", "size_sqft")
 
 
 def main():
@@ -34,9 +47,10 @@ def main():
     print("1. 📊 Crypto Analysis")
     print("2. 🏢 Dubai Property Analysis")
     print("3. 🧪 Demo Mode")
+    print("4. 📄 Batch Property Analysis (CSV)")
     print("=" * 50)
     
-    choice = input("Select option (1/2/3): ").strip()
+    choice = input("Select option (1/2/3/4): ").strip()
     
     if choice == "1":
         run_crypto_analysis()
@@ -44,8 +58,10 @@ def main():
         run_property_analysis()
     elif choice == "3":
         run_demo_mode()
+    elif choice == "4":
+        run_batch_property_analysis()
     else:
-        print("Invalid choice. Please select 1, 2, or 3.")
+        print("Invalid choice. Please select 1, 2, 3, or 4.")
 
 
 def run_crypto_analysis():
@@ -110,8 +126,18 @@ def run_property_analysis():
     
     try:
         # Get property details
-        area = input("Area (e.g., dubai-marina, downtown-dubai): ").strip()
-        property_type = input("Property type (apartment/villa/townhouse): ").strip()
+        area = parse_user_input(input("Area (e.g., dubai-marina, downtown-dubai): "))
+        if area not in _VALID_AREAS:
+            print(f"❌ Unknown area: {area}")
+            print(f"💡 Choose from: {', '.join(sorted(_VALID_AREAS))}")
+            return
+        
+        property_type = parse_user_input(input("Property type (apartment/villa/townhouse): "))
+        if property_type not in _VALID_TYPES:
+            print(f"❌ Unknown property type: {property_type}")
+            print(f"💡 Choose from: {', '.join(sorted(_VALID_TYPES))}")
+            return
+        
         bedrooms = int(input("Number of bedrooms: "))
         size_sqft = int(input("Size in square feet: "))
         asking_price = float(input("Asking price in AED: "))
@@ -140,14 +166,67 @@ def run_property_analysis():
         print(f"❌ Analysis failed: {str(e)}")
 
 
+def run_batch_property_analysis():
+    """Run Dubai property analysis over a CSV of properties"""
+    print("\n📄 Batch Property Analysis")
+    print("-" * 30)
+    print("CSV columns: area, property_type, bedrooms, size_sqft, asking_price_aed")
+    
+    path = input("CSV file path: ").strip()
+    try:
+        df = pd.read_csv(path)
+        df["area"] = df["area"].astype(str).map(parse_user_input)
+        df["property_type"] = df["property_type"].astype(str).map(parse_user_input)
+        for column in _NUMERIC_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    except (OSError, KeyError, UnicodeDecodeError,
+            pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        print(f"❌ Could not read {path}: {e}")
+        return
+    
+    invalid = ~df["area"].isin(_VALID_AREAS) | ~df["property_type"].isin(_VALID_TYPES)
+    if invalid.any():
+        print(f"⚠️ Skipping {int(invalid.sum())} rows with unknown area or property type")
+        df = df[~invalid]
+    
+    # Blank or non-numeric values, and fractional bedroom/size counts
+    bad_numbers = df[list(_NUMERIC_COLUMNS)].isna().any(axis=1)
+    for column in _INTEGER_COLUMNS:
+        bad_numbers |= df[column] % 1 != 0
+    if bad_numbers.any():
+        print(f"⚠️ Skipping {int(bad_numbers.sum())} rows with missing or invalid numbers")
+        df = df[~bad_numbers]
+    df = df.astype({column: "int64" for column in _INTEGER_COLUMNS})
+    
+    if df.empty:
+        print("❌ No valid properties to analyze")
+        return
+    
+    print(f"\n🔍 Analyzing {len(df)} properties...")
+    try:
+        result = analyze_dubai_property_batch(
+            areas=df["area"].tolist(),
+            property_types=df["property_type"].tolist(),
+            bedrooms=df["bedrooms"].to_numpy(),
+            sizes=df["size_sqft"].to_numpy(),
+            prices=df["asking_price_aed"].to_numpy()
+        )
+    except (KeyError, ValueError) as e:
+        print(f"❌ Analysis failed: {e}")
+        return
+    
+    print_property_batch_results(df, result)
+
+
 def run_demo_mode():
     """Run demo analysis with pre-configured data"""
     print("\n🧪 Demo Mode")
     print("-" * 30)
     print("1. Crypto Demo (Zcash)")
     print("2. Property Demo (Dubai Marina)")
+    print("3. Property Batch Demo (Marina, Downtown, JVC)")
     
-    choice = input("Select demo (1/2): ").strip()
+    choice = input("Select demo (1/2/3): ").strip()
     
     if choice == "1":
         print("\n📊 Demo: Zcash Analysis")
@@ -184,56 +263,108 @@ def run_demo_mode():
         
         if "error" not in result:
             print_property_results(result)
+    
+    elif choice == "3":
+        print("\n🏢 Demo: Batch Property Analysis")
+        
+        demo_properties = pd.DataFrame({
+            "area": ["dubai-marina", "downtown-dubai", "jvc"],
+            "property_type": ["apartment", "studio", "apartment"],
+            "bedrooms": [2, 0, 1],
+            "size_sqft": [1200, 480, 750],
+            "asking_price_aed": [1800000, 850000, 650000]
+        })
+        
+        result = analyze_dubai_property_batch(
+            areas=demo_properties["area"].tolist(),
+            property_types=demo_properties["property_type"].tolist(),
+            bedrooms=demo_properties["bedrooms"].to_numpy(),
+            sizes=demo_properties["size_sqft"].to_numpy(),
+            prices=demo_properties["asking_price_aed"].to_numpy()
+        )
+        print_property_batch_results(demo_properties, result)
 
 
 def print_crypto_results(result):
     """Print formatted crypto analysis results"""
-    print("\n" + "=" * 60)
-    print(f"CRYPTO ANALYSIS: {result['coin_name'].upper()}")
-    print("=" * 60)
-    print(f"Current Price: ${result['price']:,.2f}")
-    print(f"Circulating Supply: {result['circulating_supply']:,.0f}")
-    print(f"Max Supply: {result['max_supply']:,.0f}" if result['max_supply'] else "No max supply")
-    print(f"Inflation Rate: {result['inflation_rate']:.2f}%")
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append(f"CRYPTO ANALYSIS: {result['coin_name'].upper()}")
+    lines.append("=" * 60)
+    lines.append(f"Current Price: ${result['price']:,.2f}")
+    lines.append(f"Circulating Supply: {result['circulating_supply']:,.0f}")
+    lines.append(f"Max Supply: {result['max_supply']:,.0f}" if result['max_supply'] else "No max supply")
+    lines.append(f"Inflation Rate: {result['inflation_rate']:.2f}%")
     if result['fdmc']:
-        print(f"FDMC: ${result['fdmc']:,.0f}")
-    print(f"Value Locked: ${result['value_locked']:,.0f}")
-    if result['value_ratio']:
-        print(f"FDMC/Value Ratio: {result['value_ratio']:.2f}x")
+        lines.append(f"FDMC: ${result['fdmc']:,.0f}")
+    lines.append(f"Value Locked: ${result['value_locked']:,.0f}")
+    if result['fdmc_to_value_locked']:
+        lines.append(f"FDMC/Value Ratio: {result['fdmc_to_value_locked']:.2f}x")
     
-    print("\n" + "-" * 60)
-    print(f"VERDICT: {result['overall_verdict']}")
-    print("-" * 60)
+    lines.append("\n" + "-" * 60)
+    lines.append(f"VERDICT: {result['overall_verdict']}")
+    lines.append("-" * 60)
     
-    print("\nKey Reasoning:")
+    lines.append("\nKey Reasoning:")
     for reason in result['reasoning']:
-        print(f"  • {reason}")
+        lines.append(f"  • {reason}")
     
-    print("=" * 60)
+    lines.append("=" * 60)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_property_results(result):
     """Print formatted property analysis results"""
-    print("\n" + "=" * 60)
-    print("DUBAI PROPERTY ANALYSIS")
-    print("=" * 60)
-    print(f"Estimated Value: AED {result['estimated_value']:,.0f}")
-    print(f"Confidence Range: AED {result['confidence_interval']['low']:,.0f} - {result['confidence_interval']['high']:,.0f}")
-    print(f"Price vs Estimate: {result['price_to_estimate_ratio']:.2f}x")
-    print(f"Expected Rental Yield: {result['estimated_rental_yield']:.2f}%")
-    print(f"Comparable Properties: {result['comparable_properties']}")
-    
-    print("\n" + "-" * 60)
-    print(f"VERDICT: {result['valuation_signals']['overall_verdict']}")
-    print(f"Confidence: {result['valuation_signals']['confidence'].upper()}")
-    print("-" * 60)
+    lines = []
+    lines.append("\n" + "=" * 60)
+    lines.append("DUBAI PROPERTY ANALYSIS")
+    lines.append("=" * 60)
+    lines.append(f"Estimated Value: AED {result['estimated_value']:,.0f}")
+    lines.append(f"Confidence Range: AED {result['confidence_interval']['low']:,.0f} - {result['confidence_interval']['high']:,.0f}")
+    lines.append(f"Price vs Estimate: {result['price_to_estimate_ratio']:.2f}x")
+    lines.append(f"Expected Rental Yield: {result['estimated_rental_yield']:.2f}%")
+    lines.append(f"Comparable Properties: {result['comparable_properties']}")
+    
+    lines.append("\n" + "-" * 60)
+    lines.append(f"VERDICT: {result['valuation_signals']['overall_verdict']}")
+    lines.append(f"Confidence: {result['valuation_signals']['confidence'].upper()}")
+    lines.append("-" * 60)
     
     if result['valuation_signals']['key_factors']:
-        print("\nKey Factors:")
+        lines.append("\nKey Factors:")
         for factor in result['valuation_signals']['key_factors']:
-            print(f"  • {factor}")
+            lines.append(f"  • {factor}")
+    
+    lines.append("=" * 60)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_property_batch_results(properties, result):
+    """Print one line per property from a batch analysis"""
+    lines = [
+        "\n" + "=" * 92,
+        "DUBAI PROPERTY BATCH ANALYSIS",
+        "=" * 92,
+        f"{'Area':<18} {'Type':<10} {'BR':>2} {'Sqft':>6} {'Asking AED':>12} {'Estimate AED':>12} {'Yield':>6}  Verdict",
+        "-" * 92,
+    ]
+    
+    for i, row in enumerate(properties.itertuples(index=False)):
+        estimate = result["estimated_value"][i]
+        estimate_text = f"{estimate:>12,.0f}" if estimate == estimate else f"{'n/a':>12}"  # NaN check
+        yield_pct = result["estimated_rental_yield"][i]
+        yield_text = f"{yield_pct:>5.2f}%" if yield_pct == yield_pct else f"{'n/a':>6}"
+        lines.append(
+            f"{row.area:<18} {row.property_type:<10} {row.bedrooms:>2} {row.size_sqft:>6,} "
+            f"{row.asking_price_aed:>12,.0f} {estimate_text} {yield_text}  "
+            f"{result['verdict'][i]} ({result['confidence'][i]})"
+        )
+    
+    lines.append("=" * 92)
     
-    print("=" * 60)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
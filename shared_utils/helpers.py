@@ -3,12 +3,46 @@ Common Utility Functions
 Shared utilities used across both crypto and property modules
 """
 
-import json
+import base64
+import math
 import os
+import time
+from collections import deque
 from datetime import datetime, timedelta
+from decimal import Decimal
 import hashlib
 from typing import Dict, Any, Optional
 
+import numpy as np
+import orjson
+
+# Pretty-printed output, matching json.dump(indent=2); numpy values and
+# non-string keys serialize instead of raising
+_JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for the few types it can't serialize natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+
+# format_number suffixes, indexed by floor(log10(number) / 3)
+_SUFFIXES = (("", 1.0), ("K", 1e3), ("M", 1e6), ("B", 1e9), ("T", 1e12))
+
+# parse_user_input: lowercase ASCII and map spaces to hyphens in one pass
+_INPUT_NORMALIZE = str.maketrans({**{c: c + 32 for c in range(ord('A'), ord('Z') + 1)}, ord(' '): '-'})
+
+# format_currency formatters for common currencies
+_CURRENCY_FORMATS = {
+    "AED": "AED {:,.0f}".format,
+    "USD": "${:,.2f}".format,
+}
+
+# generate_cache_key's hour suffix: [timestamp the next local hour starts, formatted hour]
+_HOUR_BUCKET = [0.0, ""]
+
 
 def load_json(filepath: str) -> Dict:
     """
@@ -21,11 +55,11 @@ def load_json(filepath: str) -> Dict:
         dict: Loaded JSON data
     """
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         return {}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return {}
 
 
@@ -42,8 +76,8 @@ def save_json(data: Dict, filepath: str) -> bool:
     """
     try:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, default=_json_default, option=_JSON_DUMP_OPTIONS))
         return True
     except Exception:
         return False
@@ -60,16 +94,14 @@ def format_number(number: float, precision: int = 2) -> str:
     Returns:
         str: Formatted number string
     """
-    if number >= 1e12:
-        return f"{number/1e12:.{precision}f}T"
-    elif number >= 1e9:
-        return f"{number/1e9:.{precision}f}B"
-    elif number >= 1e6:
-        return f"{number/1e6:.{precision}f}M"
-    elif number >= 1e3:
-        return f"{number/1e3:.{precision}f}K"
-    else:
+    if not number >= 1e3:  # Also covers negatives and NaN
         return f"{number:.{precision}f}"
+    
+    idx = min(4, int(math.log10(number)) // 3) if number < 1e15 else 4
+    if number < _SUFFIXES[idx][1]:  # log10 rounded up just below a boundary
+        idx -= 1
+    suffix, divisor = _SUFFIXES[idx]
+    return f"{number/divisor:.{precision}f}{suffix}"
 
 
 def format_currency(amount: float, currency: str = "USD") -> str:
@@ -83,12 +115,8 @@ def format_currency(amount: float, currency: str = "USD") -> str:
     Returns:
         str: Formatted currency string
     """
-    if currency == "AED":
-        return f"AED {amount:,.0f}"
-    elif currency == "USD":
-        return f"${amount:,.2f}"
-    else:
-        return f"{amount:,.2f} {currency}"
+    fmt = _CURRENCY_FORMATS.get(currency)
+    return fmt(amount) if fmt else f"{amount:,.2f} {currency}"
 
 
 def is_cache_valid(filepath: str, max_age_minutes: int = 5) -> bool:
@@ -102,12 +130,10 @@ def is_cache_valid(filepath: str, max_age_minutes: int = 5) -> bool:
     Returns:
         bool: True if cache is valid
     """
-    if not os.path.exists(filepath):
+    try:
+        return time.time() - os.stat(filepath).st_mtime < max_age_minutes * 60
+    except OSError:  # Missing or unreadable, as os.path.exists treated it
         return False
-    
-    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-    age = datetime.now() - file_time
-    return age < timedelta(minutes=max_age_minutes)
 
 
 def generate_cache_key(*args) -> str:
@@ -120,9 +146,25 @@ def generate_cache_key(*args) -> str:
     Returns:
         str: Cache key
     """
-    key_string = "_".join(str(arg) for arg in args)
-    key_string += f"_{datetime.now().strftime('%Y%m%d_%H')}"
-    return hashlib.md5(key_string.encode()).hexdigest()
+    # Non-cryptographic use; BLAKE2b is faster than MD5 on short inputs
+    h = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        h.update(str(arg).encode())
+        h.update(b"_")
+    h.update(_current_hour().encode())
+    # Unpadded lowercase base32 of the 16-byte digest: 26 chars vs 32 hex,
+    # and still unique on case-insensitive filesystems
+    return base64.b32encode(h.digest()).rstrip(b"=").decode().lower()
+
+
+def _current_hour() -> str:
+    """Local hour as '%Y%m%d_%H', formatted once per hour"""
+    now = time.time()
+    if now >= _HOUR_BUCKET[0]:
+        hour = datetime.fromtimestamp(now).replace(minute=0, second=0, microsecond=0)
+        _HOUR_BUCKET[1] = hour.strftime('%Y%m%d_%H')
+        _HOUR_BUCKET[0] = (hour + timedelta(hours=1)).timestamp()
+    return _HOUR_BUCKET[1]
 
 
 def validate_api_response(response_data: Dict, required_fields: list) -> bool:
@@ -141,7 +183,7 @@ def validate_api_response(response_data: Dict, required_fields: list) -> bool:
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """
-    Safely divide two numbers, returning default if division by zero.
+    Safely divide two numbers, returning default if the denominator is zero or None.
     
     Args:
         numerator: Numerator
@@ -151,10 +193,25 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     Returns:
         float: Result of division or default
     """
-    try:
-        return numerator / denominator if denominator != 0 else default
-    except (TypeError, ZeroDivisionError):
-        return default
+    return numerator / denominator if denominator else default
+
+
+def safe_divide_arr(numerator: np.ndarray, denominator: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """
+    Element-wise safe_divide over arrays.
+    
+    Args:
+        numerator: Numerator array
+        denominator: Denominator array
+        default: Value where the denominator is zero
+        
+    Returns:
+        np.ndarray: Element-wise quotient, default where denominator is zero
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    nonzero = denominator != 0
+    return np.where(nonzero, numerator / np.where(nonzero, denominator, 1.0), default)
 
 
 def clamp(value: float, min_val: float, max_val: float) -> float:
@@ -182,7 +239,9 @@ def parse_user_input(user_input: str) -> str:
     Returns:
         str: Normalized input
     """
-    return user_input.lower().strip().replace(" ", "-")
+    normalized = user_input.strip().translate(_INPUT_NORMALIZE)
+    # Non-ASCII text still needs full Unicode lowercasing
+    return normalized if normalized.isascii() else normalized.lower()
 
 
 class RateLimiter:
@@ -190,19 +249,19 @@ class RateLimiter:
     
     def __init__(self, max_requests_per_minute: int = 10):
         self.max_requests = max_requests_per_minute
-        self.requests = []
+        self.requests = deque()  # Request timestamps, oldest first
     
     def wait_if_needed(self):
         """Wait if rate limit would be exceeded"""
-        import time
-        
         now = time.time()
         # Remove requests older than 1 minute
-        self.requests = [r for r in self.requests if now - r < 60]
+        cutoff = now - 60
+        while self.requests and self.requests[0] <= cutoff:
+            self.requests.popleft()
         
         if len(self.requests) >= self.max_requests:
             sleep_time = 60 - (now - self.requests[0]) + 0.1
             if sleep_time > 0:
                 time.sleep(sleep_time)
         
-        self.requests.append(now)
\ No newline at end of file
+        self.requests.append(now)
@@ -4,13 +4,21 @@ Handles sensitive configuration and API keys securely
 """
 
 import os
+import re
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _key_line_pattern(key_name: str) -> re.Pattern:
+    """Compiled regex matching the `KEY=...` line for key_name"""
+    return re.compile(rf"^[ \t]*{re.escape(key_name)}=.*$", re.M)
+
+
 class SecretsManager:
     """Secure management of API keys and sensitive configuration"""
     
@@ -19,17 +27,35 @@ class SecretsManager:
         self.secrets_dir.mkdir(exist_ok=True)
         self.api_keys_file = self.secrets_dir / "api_keys.env"
         
-        # Ensure proper permissions (Unix only)
+        # Parsed api_keys.env, reused until the file's mtime changes
+        self._cache: Optional[Dict[str, str]] = None
+        self._cache_mtime = 0.0
+        
+        # Ensure proper permissions (Unix only), skipping chmod when already set
         if os.name != 'nt':  # Not Windows
             try:
-                os.chmod(self.secrets_dir, 0o700)  # rwx------
-                if self.api_keys_file.exists():
+                if self.secrets_dir.stat().st_mode & 0o777 != 0o700:
+                    os.chmod(self.secrets_dir, 0o700)  # rwx------
+                if self.api_keys_file.exists() and self.api_keys_file.stat().st_mode & 0o777 != 0o600:
                     os.chmod(self.api_keys_file, 0o600)  # rw-------
             except OSError:
                 logger.warning("Could not set restrictive permissions on secrets directory")
     
     def load_api_keys(self) -> Dict[str, str]:
-        """Load API keys from the secrets file"""
+        """Load API keys from the secrets file (cached until the file changes)"""
+        try:
+            mtime = self.api_keys_file.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        
+        if self._cache is None or mtime != self._cache_mtime:
+            self._cache = self._load_from_disk()
+            self._cache_mtime = mtime
+        
+        return dict(self._cache)
+    
+    def _load_from_disk(self) -> Dict[str, str]:
+        """Parse the secrets file and export its keys to the environment"""
         api_keys = {}
         
         if not self.api_keys_file.exists():
@@ -37,19 +63,23 @@ class SecretsManager:
             return api_keys
         
         try:
-            with open(self.api_keys_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        # Skip placeholder values
-                        if not value.startswith('your_') and value != 'your_key_here':
-                            api_keys[key] = value
-                            # Set as environment variable
-                            os.environ[key] = value
+            for line in self.api_keys_file.read_text().splitlines():
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                
+                key, sep, value = line.partition('=')
+                if not sep:
+                    continue
+                key = key.strip()
+                value = value.strip()
+                
+                # Skip placeholder values
+                if not value.startswith('your_') and value != 'your_key_here':
+                    api_keys[key] = value
+                    # Set as environment variable (skip if already current)
+                    if os.environ.get(key) != value:
+                        os.environ[key] = value
             
             logger.info(f"Loaded {len(api_keys)} API keys from secrets")
             return api_keys
@@ -75,31 +105,23 @@ class SecretsManager:
             # Update environment variable
             os.environ[key_name] = value
             
-            # Update file
-            lines = []
-            found = False
-            
-            if self.api_keys_file.exists():
-                with open(self.api_keys_file, 'r') as f:
-                    lines = f.readlines()
-            
-            # Update existing key or add new one
-            for i, line in enumerate(lines):
-                if line.strip().startswith(f"{key_name}="):
-                    lines[i] = f"{key_name}={value}\n"
-                    found = True
-                    break
+            # Update file: patch the existing key line in place or append one
+            text = self.api_keys_file.read_text() if self.api_keys_file.exists() else ""
+            new_line = f"{key_name}={value}"
+            text, found = _key_line_pattern(key_name).subn(lambda _: new_line, text, count=1)
             
             if not found:
-                lines.append(f"{key_name}={value}\n")
+                if text and not text.endswith("\n"):
+                    text += "\n"
+                text += new_line + "\n"
             
-            with open(self.api_keys_file, 'w') as f:
-                f.writelines(lines)
+            self.api_keys_file.write_text(text)
             
             # Set restrictive permissions
             if os.name != 'nt':
                 os.chmod(self.api_keys_file, 0o600)
             
+            self._cache = None
             logger.info(f"Updated API key: {key_name}")
             return True
             
@@ -108,15 +130,29 @@ class SecretsManager:
             return False
 
 
-# Global instance
-secrets = SecretsManager()
+# Global instance, created on first use so importing this module touches
+# no files (module __getattr__, PEP 562)
+_secrets: Optional[SecretsManager] = None
+
+
+def _get_manager() -> SecretsManager:
+    global _secrets
+    if _secrets is None:
+        _secrets = SecretsManager()
+    return _secrets
+
+
+def __getattr__(name: str):
+    if name == "secrets":
+        return _get_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_secrets():
     """Convenience function to load all secrets"""
-    return secrets.load_api_keys()
+    return _get_manager().load_api_keys()
 
 
 def get_secret(key: str, default: str = None) -> str:
     """Convenience function to get a secret"""
-    return secrets.get_api_key(key, default)
\ No newline at end of file
+    return _get_manager().get_api_key(key, default)
@@ -7,11 +7,30 @@ Helps diagnose subscription issues
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from shared_utils.secrets_manager import load_secrets
 
+BASE_URL = "https://bayut-api1.p.rapidapi.com"
+
+# Endpoints probed in parallel; the first (usually simplest) drives the verdict
+PROBES = [
+    ("/auto-complete", {"query": "marina"}),
+    ("/properties/list", {"locationExternalIDs": "5002", "purpose": "for-rent", "hitsPerPage": 1}),
+    ("/agencies/list", {"query": "patriot", "hitsPerPage": 1}),
+]
+
+def probe(session, path, params):
+    """Call one endpoint, returning (path, status or None, first 200 chars of body or error)"""
+    try:
+        response = session.get(f"{BASE_URL}{path}", params=params, timeout=10)
+        return path, response.status_code, response.text[:200]
+    except Exception as e:
+        return path, None, str(e)
+
 def diagnose():
     load_secrets()
     api_key = os.getenv("BAYUT_API_KEY")
@@ -30,48 +49,52 @@ def diagnose():
         "X-RapidAPI-Host": "bayut-api1.p.rapidapi.com"
     }
     
+    # One keep-alive session shared by all probes
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=len(PROBES)))
+    
     print("Testing connection...")
     print()
     
-    try:
-        # Try the auto-complete endpoint (usually simpler)
-        response = requests.get(
-            "https://bayut-api1.p.rapidapi.com/auto-complete",
-            headers=headers,
-            params={"query": "marina"},
-            timeout=10
-        )
+    with ThreadPoolExecutor(max_workers=len(PROBES)) as pool:
+        results = list(pool.map(lambda probe_args: probe(session, *probe_args), PROBES))
+    
+    for path, status, text in results:
+        if status is None:
+            print(f"{path}: ❌ Error: {text}")
+        else:
+            print(f"{path}: Status Code {status}")
+            print(f"  Response: {text}")
+    print()
+    
+    status = results[0][1]
+    if status is None:
+        print(f"❌ Error: {results[0][2]}")
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.text[:200]}")
+    elif status == 403:
+        print("❌ 403 Forbidden - Subscription Issue")
+        print()
+        print("Possible causes:")
+        print("1. API key is from before you subscribed")
+        print("2. Subscription hasn't fully activated yet (wait 5-10 min)")
+        print("3. You're using a key from a different RapidAPI account")
         print()
+        print("Solutions:")
+        print("1. Go to: https://rapidapi.com/apidojo/api/bayut/")
+        print("2. Make sure you're logged in")
+        print("3. Click 'Subscribe to Test' if you see it")
+        print("4. Copy the key from the code snippet on the right")
+        print("5. Run: python3 test_scripts/update_bayut_key.py")
         
-        if response.status_code == 403:
-            print("❌ 403 Forbidden - Subscription Issue")
-            print()
-            print("Possible causes:")
-            print("1. API key is from before you subscribed")
-            print("2. Subscription hasn't fully activated yet (wait 5-10 min)")
-            print("3. You're using a key from a different RapidAPI account")
-            print()
-            print("Solutions:")
-            print("1. Go to: https://rapidapi.com/apidojo/api/bayut/")
-            print("2. Make sure you're logged in")
-            print("3. Click 'Subscribe to Test' if you see it")
-            print("4. Copy the key from the code snippet on the right")
-            print("5. Run: python3 test_scripts/update_bayut_key.py")
-            
-        elif response.status_code == 200:
-            print("✅ Success! API is working")
-            
-        elif response.status_code == 429:
-            print("⚠️  Rate limit - but subscription is working!")
-            
-        else:
-            print(f"Unexpected status code: {response.status_code}")
-            
-    except Exception as e:
-        print(f"❌ Error: {e}")
+    elif status == 200:
+        print("✅ Success! API is working")
+        
+    elif status == 429:
+        print("⚠️  Rate limit - but subscription is working!")
+        
+    else:
+        print(f"Unexpected status code: {status}")
     
     print()
     print("=" * 60)
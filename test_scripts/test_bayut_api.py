@@ -6,8 +6,9 @@ Tests the Bayut API and displays the JSON response structure
 
 import os
 import sys
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
 # Add parent directory to path to import shared utils
@@ -39,6 +40,11 @@ def test_bayut_api():
         "X-RapidAPI-Host": "bayut-api1.p.rapidapi.com"
     }
     
+    # One keep-alive session for all calls to the API host
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    
     # Test 1: Search properties in Dubai Marina - Using exact parameters from RapidAPI
     print("TEST 1: Property Listings - Dubai Marina (For Rent)")
     print("-" * 60)
@@ -55,9 +61,8 @@ def test_bayut_api():
     }
     
     try:
-        response = requests.get(
+        response = session.get(
             f"{base_url}/properties/list",
-            headers=headers,
             params=params,
             timeout=10
         )
@@ -66,7 +71,7 @@ def test_bayut_api():
         print()
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Display summary
             print(f"✅ Success! Found {len(data.get('hits', []))} properties")
@@ -74,7 +79,7 @@ def test_bayut_api():
             
             # Display structure
             print("Response Structure:")
-            print(json.dumps(data, indent=2, default=str)[:2000])  # First 2000 chars
+            print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()[:2000])  # First 2000 chars
             print("\n... (truncated)")
             print()
             
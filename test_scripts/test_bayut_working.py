@@ -5,12 +5,52 @@ Working Bayut API Test with simplified parameters
 
 import os
 import sys
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from shared_utils.secrets_manager import load_secrets
+from shared_utils.helpers import RateLimiter
+
+# Simultaneous page requests, kept within RapidAPI's per-second throughput
+MAX_PAGE_WORKERS = 5
+
+def make_session(headers):
+    """Keep-alive session carrying the RapidAPI headers"""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_PAGE_WORKERS))
+    return session
+
+def probe(session, url, params):
+    """Run one search, returning (response, exception)"""
+    try:
+        return session.get(url, params=params, timeout=15), None
+    except Exception as e:
+        return None, e
+
+def fetch_pages(session, url, params, n_pages, rate_limiter=None):
+    """
+    Fetch pages 0..n_pages-1 of a search, at most MAX_PAGE_WORKERS at a time
+    
+    Returns:
+        list: (response, exception) per page, in page order
+    """
+    limiter_lock = threading.Lock()
+    
+    def one(page):
+        if rate_limiter:
+            # RateLimiter isn't thread-safe; waiting under the lock also spaces out requests
+            with limiter_lock:
+                rate_limiter.wait_if_needed()
+        return probe(session, url, {**params, "page": page})
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, max(n_pages, 1))) as pool:
+        return list(pool.map(one, range(n_pages)))
 
 def test_bayut_working():
     """Test with working parameters"""
@@ -67,23 +107,26 @@ def test_bayut_working():
         }
     ]
     
-    for test in tests:
+    # Fire all probes at once; total time is the slowest probe, not the sum
+    with make_session(headers) as session, ThreadPoolExecutor(max_workers=len(tests)) as pool:
+        results = list(pool.map(
+            lambda t: probe(session, f"{base_url}/properties/list", t["params"]),
+            tests
+        ))
+    
+    for test, (response, error) in zip(tests, results):
         print("-" * 70)
         print(test["name"])
         print("-" * 70)
         
         try:
-            response = requests.get(
-                f"{base_url}/properties/list",
-                headers=headers,
-                params=test["params"],
-                timeout=15
-            )
+            if error:
+                raise error
             
             print(f"Status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 hits = data.get('hits', [])
                 print(f"✅ Success! Found {len(hits)} properties")
                 
@@ -105,8 +148,8 @@ def test_bayut_working():
                     
                     # Save full response for first successful test
                     if test == tests[0]:
-                        with open('test_scripts/sample_bayut_response.json', 'w') as f:
-                            json.dump(data, f, indent=2, default=str)
+                        with open('test_scripts/sample_bayut_response.json', 'wb') as f:
+                            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                         print()
                         print("  📝 Full response saved to: test_scripts/sample_bayut_response.json")
                 
@@ -119,6 +162,31 @@ def test_bayut_working():
         
         print()
     
+    # Multi-page sweep of the for-sale search, pages fetched concurrently
+    print("-" * 70)
+    print("Test 4: Multi-page sweep - Dubai Marina for sale (3 pages)")
+    print("-" * 70)
+    
+    with make_session(headers) as session:
+        pages = fetch_pages(
+            session,
+            f"{base_url}/properties/list",
+            tests[1]["params"],
+            n_pages=3,
+            rate_limiter=RateLimiter(max_requests_per_minute=30)
+        )
+    
+    for page, (response, error) in enumerate(pages):
+        if error:
+            print(f"❌ Page {page}: {error}")
+        elif response.status_code == 200:
+            hits = orjson.loads(response.content).get('hits', [])
+            print(f"✅ Page {page}: {len(hits)} properties")
+        else:
+            print(f"❌ Page {page}: status {response.status_code}")
+    
+    print()
+    
     print("=" * 70)
     print("TESTING COMPLETE")
     print("=" * 70)
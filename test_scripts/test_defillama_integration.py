@@ -3,18 +3,43 @@ Test script for DeFiLlama integration
 Tests the new TVL fetching functionality
 """
 
-from crypto_module.data_fetcher import CryptoDataFetcher
-from crypto_module.undervalued_test import run_undervalued_test
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+import pytest
 
-def test_tvl_fetching():
+# Add parent directory to path to import crypto_module
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Hits the live CoinGecko/DeFiLlama APIs, so pytest only runs it on request
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_NETWORK_TESTS"),
+    reason="network test; set RUN_NETWORK_TESTS=1 to run",
+)
+
+
+def _make_fetcher():
+    # Imported here so importing/collecting this module stays cheap
+    from crypto_module.data_fetcher import CryptoDataFetcher
+    return CryptoDataFetcher()
+
+
+@pytest.fixture(scope="session")
+def fetcher():
+    """One fetcher, and so one set of connections and caches, per session"""
+    return _make_fetcher()
+
+
+def test_tvl_fetching(fetcher):
     """Test TVL data fetching"""
+    from crypto_module.undervalued_test import run_undervalued_test
+
     print("=" * 60)
     print("Testing DeFiLlama TVL Integration")
     print("=" * 60)
 
-    fetcher = CryptoDataFetcher()
-
     # Test protocols with known TVL
     test_cases = [
         ("ethereum", "Ethereum"),
@@ -24,18 +49,40 @@ def test_tvl_fetching():
         ("uniswap", "Uniswap"),
     ]
 
+    def fetch_tvls():
+        # One /protocols request covers every protocol; only names it lacks
+        # (e.g. chains) fall back to concurrent per-slug lookups
+        tvls = fetcher.get_all_tvls()
+        tvls.update(fetcher.get_tvl_data_many(
+            protocol for protocol, _ in test_cases if protocol not in tvls
+        ))
+        return tvls
+
+    # Sections 1-3 are independent, so their requests all run at once;
+    # results are still printed in section order below
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        tvls_future = pool.submit(fetch_tvls)
+        info_future = pool.submit(fetcher.get_protocol_info, "ethereum")
+        # get_coin_data resolves names/symbols to CoinGecko IDs itself
+        coin_future = pool.submit(fetcher.get_coin_data, "ethereum")
+
     print("\n1. Testing Direct TVL Fetching:")
     print("-" * 60)
+    tvls = tvls_future.result()
+    lines = []
     for protocol, display_name in test_cases:
-        tvl = fetcher.get_tvl_data(protocol)
+        tvl = tvls[protocol]
         if tvl:
-            print(f"✓ {display_name:15} TVL: ${tvl:,.2f}")
+            lines.append(f"✓ {display_name:15} TVL: ${tvl:,.2f}")
         else:
-            print(f"✗ {display_name:15} TVL: Not found")
+            lines.append(f"✗ {display_name:15} TVL: Not found")
+    sys.stdout.write("\n".join(lines) + "\n")
+    missing = [protocol for protocol, _ in test_cases if not tvls[protocol]]
+    assert not missing, f"No TVL for: {', '.join(missing)}"
 
     print("\n2. Testing Protocol Info:")
     print("-" * 60)
-    info = fetcher.get_protocol_info("ethereum")
+    info = info_future.result()
     if info:
         print(f"✓ Protocol: {info.get('name')}")
         print(f"  Category: {info.get('category')}")
@@ -43,38 +90,32 @@ def test_tvl_fetching():
         print(f"  Chains: {', '.join(info.get('chains', [])[:5])}")
     else:
         print("✗ Could not fetch protocol info")
+    assert info is not None, "Could not fetch protocol info"
 
     print("\n3. Testing Full Coin Data with TVL:")
     print("-" * 60)
-    try:
-        # Use proper CoinGecko coin IDs
-        from crypto_module.data_fetcher import get_coin_id
-        coin_id = get_coin_id("ethereum")
-        coin_data = fetcher.get_coin_data(coin_id)
-        print(f"✓ Coin: {coin_data['name']}")
-        print(f"  Price: ${coin_data['price']:,.2f}")
-        print(f"  Market Cap: ${coin_data['market_cap']:,.2f}")
-        print(f"  Value Locked: ${coin_data.get('value_locked', 0):,.2f}")
-
-        # Test with undervalued test
-        print("\n4. Testing Undervalued Test with API Data:")
-        print("-" * 60)
-        result = run_undervalued_test(
-            crypto_name="Ethereum",
-            coin_data=coin_data
-        )
-        print(f"✓ Analysis Complete!")
-        print(f"  Verdict: {result['verdict']}")
-        print(f"  Inflation Rate: {result['inflation_rate']}%")
-        print(f"  TVL: ${result['value_locked']:,.2f}")
-        if result.get('fdmc_to_value_locked'):
-            print(f"  FDMC/TVL Ratio: {result['fdmc_to_value_locked']}x")
-        print(f"  Reasoning:")
-        for reason in result['reasoning']:
-            print(f"    - {reason}")
-
-    except Exception as e:
-        print(f"✗ Error: {str(e)}")
+    coin_data = coin_future.result()
+    print(f"✓ Coin: {coin_data['name']}")
+    print(f"  Price: ${coin_data['price']:,.2f}")
+    print(f"  Market Cap: ${coin_data['market_cap']:,.2f}")
+    print(f"  Value Locked: ${coin_data.get('value_locked', 0):,.2f}")
+    assert coin_data["price"] > 0, "CoinGecko returned no price"
+
+    # Test with undervalued test
+    print("\n4. Testing Undervalued Test with API Data:")
+    print("-" * 60)
+    result = run_undervalued_test(
+        crypto_name="Ethereum",
+        coin_data=coin_data
+    )
+    print(f"✓ Analysis Complete!")
+    print(f"  Verdict: {result['verdict']}")
+    print(f"  Inflation Rate: {result['inflation_rate']}%")
+    print(f"  TVL: ${result['value_locked']:,.2f}")
+    if result.get('fdmc_to_value_locked'):
+        print(f"  FDMC/TVL Ratio: {result['fdmc_to_value_locked']}x")
+    print(f"  Reasoning:")
+    sys.stdout.write("".join(f"    - {reason}\n" for reason in result['reasoning']))
 
     print("\n" + "=" * 60)
     print("Test Complete!")
@@ -82,4 +123,4 @@ def test_tvl_fetching():
 
 
 if __name__ == "__main__":
-    test_tvl_fetching()
+    test_tvl_fetching(_make_fetcher())
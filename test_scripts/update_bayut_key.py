@@ -4,29 +4,40 @@ Update Bayut API Key
 Helps you update the API key in secure_config/api_keys.env
 """
 
+import getpass
+import re
 import sys
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Put the project root first on the path so the dev tree shadows any installed copy
+_ROOT = str(Path(__file__).resolve().parent.parent)
+sys.path.insert(0, _ROOT)
 from shared_utils.secrets_manager import secrets
 
-print("=" * 60)
-print("UPDATE BAYUT API KEY")
-print("=" * 60)
-print()
-print("To get your API key:")
-print("1. Go to: https://rapidapi.com/apidojo/api/bayut/")
-print("2. Click on 'Code Snippets' or 'Endpoints'")
-print("3. Look for 'X-RapidAPI-Key' in the code example")
-print("4. Copy the key value")
-print()
-print("=" * 60)
-print()
+# RapidAPI keys are a single alphanumeric token
+_KEY_RE = re.compile(r"[A-Za-z0-9]{30,60}")
 
-new_key = input("Paste your new Bayut API key here: ").strip()
+if sys.stdin.isatty():
+    print("=" * 60)
+    print("UPDATE BAYUT API KEY")
+    print("=" * 60)
+    print()
+    print("To get your API key:")
+    print("1. Go to: https://rapidapi.com/apidojo/api/bayut/")
+    print("2. Click on 'Code Snippets' or 'Endpoints'")
+    print("3. Look for 'X-RapidAPI-Key' in the code example")
+    print("4. Copy the key value")
+    print()
+    print("=" * 60)
+    print()
 
-if new_key and len(new_key) > 20:
+    # getpass keeps the key off the terminal
+    new_key = getpass.getpass("Paste your new Bayut API key here: ").strip()
+else:
+    # Non-interactive: read the key from stdin, e.g. `echo $KEY | python3 ...`
+    new_key = sys.stdin.readline().strip()
+
+if _KEY_RE.fullmatch(new_key):
     success = secrets.set_api_key("BAYUT_API_KEY", new_key)
     if success:
         print()